@@ -3,12 +3,29 @@ Configuration settings for the Knowledge Graph Builder.
 Loads settings from environment variables with sensible defaults.
 """
 
+import functools
 import os
-from typing import Optional
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+# Set after the .env file has been loaded. Re-imports and child processes
+# (which inherit the environment) then skip parsing the file again.
+_DOTENV_SENTINEL = "_KG_DOTENV_LOADED"
+
+
+def _load_env() -> None:
+    """Load environment variables from the .env file once per process tree."""
+    if os.environ.get(_DOTENV_SENTINEL):
+        return
+    
+    # Imported here so processes that inherit a loaded environment never import dotenv
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ[_DOTENV_SENTINEL] = "1"
+
 
 # Load environment variables from .env file
-load_dotenv()
+_load_env()
 
 
 class Settings:
@@ -20,11 +37,40 @@ class Settings:
     LLM_MODEL_NAME: str = os.getenv("LLM_MODEL_NAME", "gpt-4o")
     LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", "0.0"))
     LLM_MAX_TOKENS: int = int(os.getenv("LLM_MAX_TOKENS", "4096"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # Mark the shared prompt prefix for provider-side caching: "auto" enables
+    # it for Anthropic-compatible endpoints, "true"/"false" force it
+    LLM_PROMPT_CACHE_CONTROL: str = os.getenv("LLM_PROMPT_CACHE_CONTROL", "auto").lower()
+    
+    # LLM Retry and Rate Limit Configuration (0 disables a rate limit)
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+    LLM_RPM: int = int(os.getenv("LLM_RPM", "0"))
+    LLM_TPM: int = int(os.getenv("LLM_TPM", "0"))
+    
+    # LLM Response Cache Configuration
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", "~/.cache/kgbuilder")
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "0"))
+    LLM_CACHE_MEMORY_SIZE: int = int(os.getenv("LLM_CACHE_MEMORY_SIZE", "1024"))
+    
+    # Semantic Cache Configuration (reuses responses for near-duplicate chunks)
+    LLM_SEMANTIC_CACHE_ENABLED: bool = os.getenv("LLM_SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    LLM_SEMANTIC_CACHE_MODEL: str = os.getenv(
+        "LLM_SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+    )
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.95"))
     
     # Text Processing Configuration
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "150"))
     CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "30"))
     
+    # Extraction Prefilter Configuration (skips chunks unlikely to hold facts)
+    EXTRACTION_PREFILTER: bool = os.getenv("EXTRACTION_PREFILTER", "false").lower() == "true"
+    EXTRACTION_MIN_WORDS: int = int(os.getenv("EXTRACTION_MIN_WORDS", "20"))
+    EXTRACTION_MIN_ALPHA_RATIO: float = float(os.getenv("EXTRACTION_MIN_ALPHA_RATIO", "0.5"))
+    EXTRACTION_PACK_TOKENS: int = int(os.getenv("EXTRACTION_PACK_TOKENS", "0"))
+    
     # Visualization Configuration
     GRAPH_LAYOUT: str = os.getenv("GRAPH_LAYOUT", "cose")
     ANIMATE_LAYOUT: bool = os.getenv("ANIMATE_LAYOUT", "true").lower() == "true"
@@ -61,28 +107,31 @@ class Settings:
             )
     
     @classmethod
-    def get_llm_config(cls) -> dict:
-        """Get LLM configuration as a dictionary."""
-        return {
+    @functools.lru_cache(maxsize=1)
+    def get_llm_config(cls) -> Mapping[str, Any]:
+        """Get LLM configuration as a read-only mapping (built once)."""
+        return MappingProxyType({
             "api_key": cls.OPENAI_API_KEY,
             "base_url": cls.OPENAI_API_BASE,
             "model": cls.LLM_MODEL_NAME,
             "temperature": cls.LLM_TEMPERATURE,
             "max_tokens": cls.LLM_MAX_TOKENS,
-        }
+        })
     
     @classmethod
-    def get_chunk_config(cls) -> dict:
-        """Get text chunking configuration as a dictionary."""
-        return {
+    @functools.lru_cache(maxsize=1)
+    def get_chunk_config(cls) -> Mapping[str, Any]:
+        """Get text chunking configuration as a read-only mapping (built once)."""
+        return MappingProxyType({
             "chunk_size": cls.CHUNK_SIZE,
             "overlap": cls.CHUNK_OVERLAP,
-        }
+        })
     
     @classmethod
-    def get_layout_config(cls) -> dict:
-        """Get graph layout configuration as a dictionary."""
-        return {
+    @functools.lru_cache(maxsize=1)
+    def get_layout_config(cls) -> Mapping[str, Any]:
+        """Get graph layout configuration as a read-only mapping (built once)."""
+        return MappingProxyType({
             "name": cls.GRAPH_LAYOUT,
             "animate": cls.ANIMATE_LAYOUT,
             "nodeRepulsion": cls.LAYOUT_NODE_REPULSION,
@@ -95,7 +144,7 @@ class Settings:
             "initialTemp": cls.LAYOUT_INITIAL_TEMP,
             "coolingFactor": cls.LAYOUT_COOLING_FACTOR,
             "minTemp": cls.LAYOUT_MIN_TEMP,
-        }
+        })
 
 
 # Create a global settings instance
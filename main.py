@@ -86,7 +86,7 @@ for key, value in graph_stats.items():
 
 # Cell 8: Visualize
 visualizer = CytoscapeVisualizer()
-widget = visualizer.create_widget(graph)
+widget = visualizer.create_widget(graph, degrees=builder.get_node_degrees(graph))
 
 print("\nInteractive graph created!")
 print("Interact: Zoom (scroll), Pan (drag), Move nodes, Hover for details")
@@ -3,7 +3,7 @@ Triple extraction module.
 Extracts and validates SPO triples from text.
 """
 
-from .extractor import TripleExtractor
-from .validator import TripleValidator
+from .extractor import TripleExtractor, is_extractable
+from .validator import Triple, TripleStore, TripleValidator
 
-__all__ = ['TripleExtractor', 'TripleValidator']
+__all__ = ['TripleExtractor', 'is_extractable', 'Triple', 'TripleStore', 'TripleValidator']
@@ -3,27 +3,245 @@ Triple extraction module for extracting SPO triples from text chunks using LLMs.
 Handles API calls, JSON parsing, and error recovery.
 """
 
+import asyncio
 import json
-import re
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Any, Coroutine, Iterable, Iterator, List, Dict, Optional
+from config.settings import settings
 from src.llm.client import LLMClient
 from src.llm.prompts import PromptTemplates
+from src.text_processing.chunker import Chunk
 from src.extraction.validator import TripleValidator
 
+# Prefer orjson for parsing LLM output; fall back to the standard library
+try:
+    import orjson as _json_backend
+except ImportError:
+    _json_backend = json
+
+# Shared decoder for locating a JSON array embedded in surrounding text
+_JSON_DECODER = json.JSONDecoder()
+
+
+def is_extractable(
+    text: str,
+    min_words: int = None,
+    min_alpha_ratio: float = None
+) -> bool:
+    """
+    Cheaply decide whether a chunk is worth sending to the LLM.
+    
+    Chunks that are very short, mostly non-alphabetic (tables, numbers,
+    markup) or contain no capitalized word rarely yield any triples. The
+    capitalization check covers any cased script and is skipped for text
+    written in scripts without case.
+    
+    Args:
+        text: Chunk text
+        min_words: Minimum number of words (defaults to settings)
+        min_alpha_ratio: Minimum fraction of alphabetic characters
+            (defaults to settings)
+        
+    Returns:
+        True if the chunk should be extracted
+    """
+    if min_words is None:
+        min_words = settings.EXTRACTION_MIN_WORDS
+    if min_alpha_ratio is None:
+        min_alpha_ratio = settings.EXTRACTION_MIN_ALPHA_RATIO
+    
+    words = text.split()
+    if len(words) < min_words:
+        return False
+    if sum(char.isalpha() for char in text) < min_alpha_ratio * len(text):
+        return False
+    
+    # A capitalized word is the cheapest sign of a named entity
+    initials = [word[0] for word in words if word[0].isupper() or word[0].islower()]
+    return not initials or any(initial.isupper() for initial in initials)
+
+
+def _run_coroutine(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Jupyter already runs an event loop in the main thread, where
+    ``asyncio.run`` is not allowed; in that case the coroutine is run
+    on a fresh loop in a worker thread instead.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class TripleExtractor:
     """Extracts Subject-Predicate-Object triples from text using LLMs."""
     
-    def __init__(self, llm_client: LLMClient):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        max_concurrency: int = None,
+        prefilter: bool = None,
+        pack_tokens: int = None
+    ):
         """
         Initialize the triple extractor.
         
         Args:
             llm_client: Initialized LLM client for API calls
+            max_concurrency: Maximum number of chunk requests in flight at once
+                (defaults to settings)
+            prefilter: In multi-chunk documents, skip the LLM call for chunks
+                that fail is_extractable() (defaults to settings)
+            pack_tokens: Estimated token budget for packing several chunks
+                into one request, 0 for one request per chunk (defaults to
+                settings)
         """
         self.llm_client = llm_client
         self.validator = TripleValidator()
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.prefilter = settings.EXTRACTION_PREFILTER if prefilter is None else prefilter
+        self.pack_tokens = settings.EXTRACTION_PACK_TOKENS if pack_tokens is None else pack_tokens
         self.failed_chunks = []
+        self.skipped_chunks = []
+    
+    @staticmethod
+    def _new_result(chunk_number: int) -> Dict[str, any]:
+        """Create an empty extraction result for a chunk."""
+        return {
+            'chunk_number': chunk_number,
+            'triples': [],
+            'raw_response': None,
+            'parsed_json': None,
+            'error': None,
+        }
+    
+    def _process_raw_output(
+        self,
+        result: Dict[str, any],
+        raw_output: str
+    ) -> None:
+        """
+        Parse and validate raw LLM output into the given result.
+        
+        Args:
+            result: Extraction result to fill in
+            raw_output: Raw string output from LLM
+        """
+        result['raw_response'] = raw_output
+        
+        # Parse JSON
+        self._apply_parsed_json(result, self._parse_json_response(raw_output))
+    
+    def _process_packed_output(
+        self,
+        results: List[Dict[str, any]],
+        raw_output: str
+    ) -> None:
+        """
+        Parse and validate the raw output of a packed request.
+        
+        Args:
+            results: Extraction results of the packed chunks, in passage order
+            raw_output: Raw string output from LLM
+        """
+        parsed_json = self._parse_packed_response(raw_output)
+        numbers = [str(number) for number in range(1, len(results) + 1)]
+        
+        # An object without any passage number (e.g. the single-chunk
+        # {"triples": [...]} shape) does not answer the packed prompt
+        if parsed_json is not None and not any(number in parsed_json for number in numbers):
+            parsed_json = None
+        
+        for number, result in zip(numbers, results):
+            result['raw_response'] = raw_output
+            if parsed_json is not None and number not in parsed_json:
+                result['error'] = f'Passage {number} missing from packed response'
+                self.failed_chunks.append(result)
+                continue
+            
+            passage_json = parsed_json.get(number) if parsed_json is not None else None
+            if not isinstance(passage_json, list):
+                passage_json = None
+            self._apply_parsed_json(result, passage_json)
+    
+    def _apply_parsed_json(
+        self,
+        result: Dict[str, any],
+        parsed_json: Optional[List[Dict]]
+    ) -> None:
+        """
+        Validate the parsed triples of a chunk into its result.
+        
+        Args:
+            result: Extraction result to fill in
+            parsed_json: Parsed list of triples, None if parsing failed
+        """
+        result['parsed_json'] = parsed_json
+        
+        if parsed_json is None:
+            result['error'] = 'JSON parsing failed'
+            self.failed_chunks.append(result)
+            return
+        
+        # Validate and extract triples
+        valid_triples = self.validator.validate_triples(parsed_json, result['chunk_number'])
+        result['triples'] = valid_triples
+    
+    def _pack(self, chunks: List[Chunk], positions: List[int]) -> List[List[int]]:
+        """
+        Group chunks into requests.
+        
+        Consecutive chunks are packed greedily until their estimated tokens
+        (about four characters per token) would exceed pack_tokens. With
+        packing disabled every chunk is a request of its own.
+        
+        Args:
+            chunks: Chunk records
+            positions: Positions in chunks of the chunks to send
+            
+        Returns:
+            List of requests, each a list of positions in chunks
+        """
+        if self.pack_tokens <= 0:
+            return [[position] for position in positions]
+        
+        packs = []
+        pack_tokens = 0
+        for position in positions:
+            tokens = len(chunks[position].text) // 4
+            if packs and pack_tokens + tokens <= self.pack_tokens:
+                packs[-1].append(position)
+                pack_tokens += tokens
+            else:
+                packs.append([position])
+                pack_tokens = tokens
+        return packs
+    
+    def _discard_if_failed(
+        self,
+        results: List[Dict[str, any]],
+        system_prompt: str,
+        user_prompt: str,
+        semantic_key: Optional[str]
+    ) -> None:
+        """Drop the cached response of a request whose output could not be parsed."""
+        if any(result['error'] for result in results):
+            self.llm_client.discard_cached(
+                system_prompt, user_prompt,
+                semantic_key=semantic_key
+            )
     
     def extract_from_chunk(
         self,
@@ -44,13 +262,7 @@ class TripleExtractor:
             - parsed_json: Parsed JSON data
             - error: Error message if extraction failed
         """
-        result = {
-            'chunk_number': chunk_number,
-            'triples': [],
-            'raw_response': None,
-            'parsed_json': None,
-            'error': None,
-        }
+        result = self._new_result(chunk_number)
         
         try:
             # Get prompts
@@ -60,25 +272,52 @@ class TripleExtractor:
             response = self.llm_client.chat_completion(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
-                response_format={"type": "json_object"}
+                semantic_key=chunk_text
             )
             
             # Extract raw content
             raw_output = self.llm_client.extract_content(response)
-            result['raw_response'] = raw_output
+            self._process_raw_output(result, raw_output)
+            self._discard_if_failed([result], system_prompt, user_prompt, chunk_text)
+            
+        except Exception as e:
+            result['error'] = f'Extraction error: {str(e)}'
+            self.failed_chunks.append(result)
+        
+        return result
+    
+    async def extract_from_chunk_async(
+        self,
+        chunk_text: str,
+        chunk_number: int
+    ) -> Dict[str, any]:
+        """
+        Extract triples from a single text chunk without blocking the event loop.
+        
+        Args:
+            chunk_text: The text to extract triples from
+            chunk_number: Sequential number of this chunk
             
-            # Parse JSON
-            parsed_json = self._parse_json_response(raw_output)
-            result['parsed_json'] = parsed_json
+        Returns:
+            Dictionary with the same structure as extract_from_chunk()
+        """
+        result = self._new_result(chunk_number)
+        
+        try:
+            # Get prompts
+            system_prompt, user_prompt = PromptTemplates.get_prompts_for_chunk(chunk_text)
             
-            if parsed_json is None:
-                result['error'] = 'JSON parsing failed'
-                self.failed_chunks.append(result)
-                return result
+            # Make API call
+            response = await self.llm_client.chat_completion_async(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                semantic_key=chunk_text
+            )
             
-            # Validate and extract triples
-            valid_triples = self.validator.validate_triples(parsed_json, chunk_number)
-            result['triples'] = valid_triples
+            # Extract raw content
+            raw_output = self.llm_client.extract_content(response)
+            self._process_raw_output(result, raw_output)
+            self._discard_if_failed([result], system_prompt, user_prompt, chunk_text)
             
         except Exception as e:
             result['error'] = f'Extraction error: {str(e)}'
@@ -86,33 +325,166 @@ class TripleExtractor:
         
         return result
     
+    async def _extract_from_chunks_async(
+        self,
+        chunks: List[Chunk],
+        prefilter: bool = False
+    ) -> List[Dict[str, any]]:
+        """
+        Extract triples from multiple chunks concurrently.
+        
+        Each response is parsed and validated as soon as it arrives, while
+        the remaining requests are still in flight. Chunks rejected by the
+        prefilter keep an empty result and are never sent. With pack_tokens
+        set, consecutive chunks share a request.
+        
+        Args:
+            chunks: List of Chunk records from TextChunker
+            prefilter: Whether to skip chunks that fail is_extractable()
+            
+        Returns:
+            List of per-chunk extraction results, in chunk order
+        """
+        results = [self._new_result(chunk.chunk_number) for chunk in chunks]
+        failed_start = len(self.failed_chunks)
+        
+        # Positions in chunks/results of the chunks actually sent
+        sent = []
+        for i, chunk in enumerate(chunks):
+            if prefilter and not is_extractable(chunk.text):
+                self.skipped_chunks.append(chunk.chunk_number)
+            else:
+                sent.append(i)
+        if not sent:
+            return results
+        
+        packs = self._pack(chunks, sent)
+        prompts = []
+        semantic_keys = []
+        for pack in packs:
+            if len(pack) == 1:
+                chunk_text = chunks[pack[0]].text
+                prompts.append(PromptTemplates.get_prompts_for_chunk(chunk_text))
+                semantic_keys.append(chunk_text)
+            else:
+                prompts.append(PromptTemplates.get_prompts_for_passages(
+                    [chunks[i].text for i in pack]
+                ))
+                # One embedding of several passages is too coarse to match on
+                semantic_keys.append(None)
+        
+        completions = self.llm_client.iter_chat_completions(
+            prompts,
+            concurrency=self.max_concurrency,
+            semantic_keys=semantic_keys
+        )
+        
+        try:
+            async for position, response in completions:
+                pack_results = [results[i] for i in packs[position]]
+                system_prompt, user_prompt = prompts[position]
+                try:
+                    if isinstance(response, BaseException):
+                        raise response
+                    raw_output = self.llm_client.extract_content(response)
+                    if len(pack_results) == 1:
+                        self._process_raw_output(pack_results[0], raw_output)
+                    else:
+                        self._process_packed_output(pack_results, raw_output)
+                    self._discard_if_failed(
+                        pack_results, system_prompt, user_prompt, semantic_keys[position]
+                    )
+                except Exception as e:
+                    for result in pack_results:
+                        result['error'] = f'Extraction error: {str(e)}'
+                        self.failed_chunks.append(result)
+        finally:
+            # Every _run_coroutine call runs on a fresh event loop; release
+            # this loop's HTTP client before the loop ends
+            await self.llm_client.aclose()
+        
+        # Report failures in chunk order rather than completion order
+        self.failed_chunks[failed_start:] = [
+            result for result in results if result['error']
+        ]
+        
+        return results
+    
     def extract_from_chunks(
         self,
-        chunks: List[Dict[str, any]]
+        chunks: List[Chunk]
     ) -> List[Dict[str, any]]:
         """
         Extract triples from multiple text chunks.
         
+        Chunks are sent to the LLM concurrently (up to max_concurrency
+        requests in flight); triples are returned in chunk order.
+        
         Args:
-            chunks: List of chunk dictionaries from TextChunker
+            chunks: List of Chunk records from TextChunker
             
         Returns:
             List of all valid extracted triples
         """
         all_triples = []
         self.failed_chunks = []
+        self.skipped_chunks = []
         
-        for chunk in chunks:
-            chunk_text = chunk['text']
-            chunk_number = chunk['chunk_number']
-            
-            result = self.extract_from_chunk(chunk_text, chunk_number)
-            
+        if not chunks:
+            return all_triples
+        
+        # A document's only chunk is always extracted
+        prefilter = self.prefilter and len(chunks) > 1
+        results = _run_coroutine(self._extract_from_chunks_async(chunks, prefilter))
+        
+        for result in results:
             if result['triples']:
                 all_triples.extend(result['triples'])
         
         return all_triples
     
+    def iter_triples(
+        self,
+        chunks: Iterable[Chunk]
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Lazily extract triples from a stream of text chunks.
+        
+        Chunks are read in windows of max_concurrency requests. Each window
+        is extracted concurrently and its triples are yielded in chunk order
+        before the next window is read, so memory stays bounded by one
+        window regardless of document size.
+        
+        Args:
+            chunks: Iterable of Chunk records from TextChunker
+            
+        Yields:
+            Valid extracted triples
+        """
+        self.failed_chunks = []
+        self.skipped_chunks = []
+        chunk_iter = iter(chunks)
+        
+        window_size = self.max_concurrency
+        if self.pack_tokens > 0:
+            # Estimate chunks per request from the configured chunk size,
+            # at about 1.5 tokens per word
+            chunk_tokens = max(settings.CHUNK_SIZE * 3 // 2, 1)
+            window_size *= max(self.pack_tokens // chunk_tokens, 1)
+        
+        window = list(islice(chunk_iter, window_size))
+        
+        # A document's only chunk is always extracted; peek past a single
+        # first chunk to tell whether more follow
+        lookahead = list(islice(chunk_iter, 1)) if len(window) == 1 else []
+        prefilter = self.prefilter and len(window) + len(lookahead) > 1
+        chunk_iter = chain(lookahead, chunk_iter)
+        
+        while window:
+            for result in _run_coroutine(self._extract_from_chunks_async(window, prefilter)):
+                yield from result['triples']
+            window = list(islice(chunk_iter, window_size))
+    
     def _parse_json_response(self, raw_output: str) -> Optional[List[Dict]]:
         """
         Parse JSON from LLM response with fallback strategies.
@@ -123,12 +495,23 @@ class TripleExtractor:
         Returns:
             Parsed list of dictionaries or None if parsing fails
         """
-        try:
-            # Strategy 1: Direct parsing
-            parsed_data = json.loads(raw_output)
+        # Strategy 1: Direct parsing. Peek at the first character so text
+        # that is obviously not JSON skips straight to the fallback instead
+        # of raising and catching a decode error.
+        stripped = raw_output.lstrip()
+        first = stripped[:1]
+        if first == '{' or first == '[':
+            try:
+                parsed_data = _json_backend.loads(stripped)
+            except ValueError:
+                parsed_data = None
             
-            # Handle response_format={'type':'json_object'} that returns a dict
+            # JSON mode returns {"triples": [...]}; accept any other
+            # wrapper key as long as it holds the only list
             if isinstance(parsed_data, dict):
+                triples = parsed_data.get('triples')
+                if isinstance(triples, list):
+                    return triples
                 # Extract list from dictionary values
                 list_values = [v for v in parsed_data.values() if isinstance(v, list)]
                 if len(list_values) == 1:
@@ -137,19 +520,54 @@ class TripleExtractor:
                     return None
             elif isinstance(parsed_data, list):
                 return parsed_data
-            else:
+            elif parsed_data is not None:
                 return None
-                
+        
+        # Strategy 2: Decode the array wrapped in text/markdown, starting
+        # at the first '['. raw_decode stops at the end of the array, so
+        # this is a single linear scan with no regex backtracking.
+        start = raw_output.find('[')
+        if start == -1:
+            return None
+        try:
+            parsed_data, _ = _JSON_DECODER.raw_decode(raw_output, start)
         except json.JSONDecodeError:
-            # Strategy 2: Regex fallback for arrays wrapped in text/markdown
-            match = re.search(r'^\s*(\[.*?\])\s*$', raw_output, re.DOTALL)
-            if match:
-                json_string_extracted = match.group(1)
-                try:
-                    return json.loads(json_string_extracted)
-                except json.JSONDecodeError:
-                    return None
             return None
+        return parsed_data
+    
+    def _parse_packed_response(self, raw_output: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse the JSON object answering a packed request.
+        
+        Args:
+            raw_output: Raw string output from LLM
+            
+        Returns:
+            Dictionary mapping passage numbers to lists of triples, or None
+            if parsing fails
+        """
+        stripped = raw_output.lstrip()
+        if stripped[:1] == '{':
+            try:
+                parsed_data = _json_backend.loads(stripped)
+            except ValueError:
+                parsed_data = None
+            if isinstance(parsed_data, dict):
+                return parsed_data
+        
+        # Fall back to the first object embedded in text/markdown
+        start = raw_output.find('{')
+        if start == -1:
+            return None
+        try:
+            parsed_data, _ = _JSON_DECODER.raw_decode(raw_output, start)
+        except json.JSONDecodeError:
+            return None
+        return parsed_data if isinstance(parsed_data, dict) else None
+    
+    def clear_cache(self) -> None:
+        """Remove all cached LLM responses so every chunk is re-extracted."""
+        self.llm_client.clear_cache()
     
     def get_failed_chunks(self) -> List[Dict[str, any]]:
         """
@@ -160,6 +578,15 @@ class TripleExtractor:
         """
         return self.failed_chunks
     
+    def get_skipped_chunks(self) -> List[int]:
+        """
+        Get the numbers of chunks skipped by the prefilter.
+        
+        Returns:
+            List of skipped chunk numbers
+        """
+        return self.skipped_chunks
+    
     def get_extraction_statistics(
         self,
         total_chunks: int,
@@ -177,8 +604,9 @@ class TripleExtractor:
         """
         return {
             'total_chunks': total_chunks,
+            'skipped_chunks': len(self.skipped_chunks),
             'failed_chunks': len(self.failed_chunks),
-            'successful_chunks': total_chunks - len(self.failed_chunks),
+            'successful_chunks': total_chunks - len(self.failed_chunks) - len(self.skipped_chunks),
             'total_triples_extracted': total_triples,
             'avg_triples_per_chunk': total_triples / total_chunks if total_chunks > 0 else 0,
         }
\ No newline at end of file
@@ -3,16 +3,111 @@ Validation module for extracted SPO triples.
 Ensures triples have correct structure and valid data types.
 """
 
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+
+
+class Triple(NamedTuple):
+    """A validated Subject-Predicate-Object triple and the chunk it came from."""
+    
+    subject: str
+    predicate: str
+    object: str
+    chunk: Optional[Union[int, str]] = None
+    
+    def asdict(self) -> Dict[str, Any]:
+        """
+        Convert the triple to a plain dictionary (e.g. for DataFrame display).
+        
+        Returns:
+            Dictionary with 'subject', 'predicate', 'object' and 'chunk' keys
+        """
+        return self._asdict()
+
+
+@dataclass
+class TripleStore:
+    """
+    Triples stored column-wise: one list per field instead of one record
+    per triple.
+    
+    Bulk consumers (graph building, DataFrames, Arrow) read the columns
+    directly; iterating or indexing still yields Triple records.
+    """
+    
+    subjects: List[str] = field(default_factory=list)
+    predicates: List[str] = field(default_factory=list)
+    objects: List[str] = field(default_factory=list)
+    chunks: List[Optional[Union[int, str]]] = field(default_factory=list)
+    
+    def append(self, triple: Triple) -> None:
+        """
+        Add a triple to the end of the store.
+        
+        Args:
+            triple: Triple record to add
+        """
+        self.subjects.append(triple.subject)
+        self.predicates.append(triple.predicate)
+        self.objects.append(triple.object)
+        self.chunks.append(triple.chunk)
+    
+    def __len__(self) -> int:
+        """Number of triples in the store."""
+        return len(self.subjects)
+    
+    def __iter__(self) -> Iterator[Triple]:
+        """Iterate over the triples as Triple records."""
+        return map(Triple, self.subjects, self.predicates, self.objects, self.chunks)
+    
+    def __getitem__(self, index: int) -> Triple:
+        """Get the triple at a position as a Triple record."""
+        return Triple(
+            self.subjects[index], self.predicates[index],
+            self.objects[index], self.chunks[index]
+        )
+    
+    def asdict(self) -> Dict[str, List[Any]]:
+        """
+        Get the columns keyed by field name (e.g. for pd.DataFrame).
+        
+        Returns:
+            Dictionary with 'subject', 'predicate', 'object' and 'chunk' lists
+        """
+        return {
+            'subject': self.subjects,
+            'predicate': self.predicates,
+            'object': self.objects,
+            'chunk': self.chunks,
+        }
+    
+    def to_arrow(self):
+        """
+        Convert the store to a pyarrow Table.
+        
+        Entity and predicate columns are dictionary-encoded, so each
+        distinct string is stored once however often it repeats. The
+        chunk column is int64; labels that are not chunk numbers (such as
+        'unknown' for triples without one) become null. Requires the
+        optional pyarrow package.
+        
+        Returns:
+            pyarrow.Table with 'subject', 'predicate', 'object', 'chunk' columns
+        """
+        import pyarrow as pa
+        
+        chunks = [chunk if isinstance(chunk, int) else None for chunk in self.chunks]
+        return pa.table({
+            'subject': pa.array(self.subjects, type=pa.string()).dictionary_encode(),
+            'predicate': pa.array(self.predicates, type=pa.string()).dictionary_encode(),
+            'object': pa.array(self.objects, type=pa.string()).dictionary_encode(),
+            'chunk': pa.array(chunks, type=pa.int64()),
+        })
 
 
 class TripleValidator:
     """Validates the structure and content of extracted SPO triples."""
     
-    def __init__(self):
-        """Initialize the validator."""
-        self.required_keys = {'subject', 'predicate', 'object'}
-    
     def validate_triple(self, triple: Any) -> bool:
         """
         Validate a single triple.
@@ -27,25 +122,22 @@ class TripleValidator:
         if not isinstance(triple, dict):
             return False
         
-        # Check if all required keys are present
-        if not all(key in triple for key in self.required_keys):
-            return False
-        
-        # Check if all values are strings
-        if not all(isinstance(triple[key], str) for key in self.required_keys):
-            return False
-        
-        # Check if all values are non-empty
-        if not all(triple[key].strip() for key in self.required_keys):
-            return False
+        # Unrolled over the three required keys: each value must be present,
+        # a string, and non-empty after stripping whitespace
+        subject = triple.get('subject')
+        predicate = triple.get('predicate')
+        obj = triple.get('object')
         
-        return True
+        return (
+            type(subject) is str and type(predicate) is str and type(obj) is str
+            and bool(subject.strip()) and bool(predicate.strip()) and bool(obj.strip())
+        )
     
     def validate_triples(
         self,
         triples: Any,
         chunk_number: int = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Triple]:
         """
         Validate a list of triples and add chunk information.
         
@@ -54,21 +146,16 @@ class TripleValidator:
             chunk_number: Optional chunk number to add to valid triples
             
         Returns:
-            List of valid triples with chunk information added
+            List of valid triples as Triple records carrying the chunk number
         """
         if not isinstance(triples, list):
             return []
         
-        valid_triples = []
-        
-        for triple in triples:
-            if self.validate_triple(triple):
-                # Add chunk information if provided
-                if chunk_number is not None:
-                    triple['chunk'] = chunk_number
-                valid_triples.append(triple)
-        
-        return valid_triples
+        return [
+            Triple(triple['subject'], triple['predicate'], triple['object'], chunk_number)
+            for triple in triples
+            if self.validate_triple(triple)
+        ]
     
     def get_validation_report(
         self,
@@ -3,8 +3,30 @@ Graph building module for creating NetworkX graphs from SPO triples.
 Constructs directed graphs with nodes and labeled edges.
 """
 
-import networkx as nx
-from typing import List, Dict, Any
+from __future__ import annotations
+
+import heapq
+import importlib
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Iterable, List, Dict, Any, Union
+from src.extraction.validator import TripleStore
+
+if TYPE_CHECKING:
+    import networkx as nx
+    from src.extraction.validator import Triple
+
+# Key of the degree map in a graph's __networkx_cache__
+_DEGREES_CACHE_KEY = 'kg_pipeline_node_degrees'
+
+
+def _nx():
+    """
+    Get the networkx module, importing it on first use.
+    
+    NetworkX is slow to import, so it is only loaded once a graph
+    is actually built or inspected.
+    """
+    return importlib.import_module('networkx')
 
 
 class GraphBuilder:
@@ -14,33 +36,70 @@ class GraphBuilder:
         """Initialize the graph builder."""
         self.graph = None
     
-    def build_graph(self, triples: List[Dict[str, str]]) -> nx.DiGraph:
+    def build_graph(self, triples: Union[TripleStore, Iterable[Triple]]) -> nx.DiGraph:
         """
         Build a directed graph from a list of SPO triples.
         
         Args:
-            triples: List of triple dictionaries with 'subject', 'predicate', 'object'
+            triples: TripleStore (e.g. from TripleNormalizer) or Triple records
             
         Returns:
             NetworkX DiGraph with nodes and labeled edges
         """
         # Create empty directed graph
-        self.graph = nx.DiGraph()
+        self.graph = _nx().DiGraph()
         
         if not triples:
             return self.graph
         
-        # Add edges (nodes are added automatically)
-        for triple in triples:
-            subject = triple['subject']
-            predicate = triple['predicate']
-            obj = triple['object']
-            
-            # Add edge with predicate as label
-            self.graph.add_edge(subject, obj, label=predicate)
+        # Add all edges in one batch with predicate as label
+        # (nodes are added automatically)
+        if isinstance(triples, TripleStore):
+            # Read the columns directly instead of building Triple records
+            spo = zip(triples.subjects, triples.predicates, triples.objects)
+        else:
+            spo = map(attrgetter('subject', 'predicate', 'object'), triples)
+        self.graph.add_edges_from(
+            (subject, obj, {'label': predicate})
+            for subject, predicate, obj in spo
+        )
         
         return self.graph
     
+    def get_node_degrees(self, graph: nx.DiGraph = None) -> Dict[Any, int]:
+        """
+        Get the degree of every node, cached until the graph changes.
+        
+        The result is stored in the graph's ``__networkx_cache__``, which
+        NetworkX (3.3+) clears on every node or edge addition and removal,
+        so statistics, top-node queries and Cytoscape conversion share a
+        single pass over the edges while the graph is unchanged. Editing
+        the adjacency dicts directly bypasses that and leaves the cached
+        degrees stale. Treat the returned dict as read-only.
+        
+        Args:
+            graph: NetworkX graph (uses internal graph if not provided)
+            
+        Returns:
+            Dictionary mapping node ID to degree
+        """
+        if graph is None:
+            graph = self.graph
+        
+        if graph is None:
+            return {}
+        
+        # Older NetworkX versions have no cache, and views (which are frozen)
+        # change with their base graph without clearing it; compute those fresh
+        cache = getattr(graph, '__networkx_cache__', None)
+        if cache is None or _nx().is_frozen(graph):
+            return dict(graph.degree())
+        
+        degrees = cache.get(_DEGREES_CACHE_KEY)
+        if degrees is None:
+            degrees = cache[_DEGREES_CACHE_KEY] = dict(graph.degree())
+        return degrees
+    
     def get_graph_statistics(self, graph: nx.DiGraph = None) -> Dict[str, Any]:
         """
         Get statistics about the graph.
@@ -66,6 +125,7 @@ class GraphBuilder:
         num_nodes = graph.number_of_nodes()
         num_edges = graph.number_of_edges()
         
+        nx = _nx()
         stats = {
             'num_nodes': num_nodes,
             'num_edges': num_edges,
@@ -77,7 +137,7 @@ class GraphBuilder:
             stats['num_weakly_connected_components'] = nx.number_weakly_connected_components(graph)
         
         # Add degree statistics
-        degrees = dict(graph.degree())
+        degrees = self.get_node_degrees(graph)
         if degrees:
             stats['avg_degree'] = sum(degrees.values()) / len(degrees)
             stats['max_degree'] = max(degrees.values())
@@ -107,14 +167,14 @@ class GraphBuilder:
             return []
         
         # Get degrees
-        degrees = dict(graph.degree())
+        degrees = self.get_node_degrees(graph)
         
-        # Sort by degree and get top N
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:n]
+        # Select top N by degree without sorting every node
+        top_nodes = heapq.nlargest(n, degrees.items(), key=itemgetter(1))
         
         return [
             {'node': node, 'degree': degree}
-            for node, degree in sorted_nodes
+            for node, degree in top_nodes
         ]
     
     def get_node_info(self, node_id: str, graph: nx.DiGraph = None) -> Dict[str, Any]:
@@ -134,18 +194,14 @@ class GraphBuilder:
         if graph is None or node_id not in graph:
             return {'error': 'Node not found'}
         
-        # Get neighbors
-        predecessors = list(graph.predecessors(node_id))
-        successors = list(graph.successors(node_id))
-        
-        # Get edges
+        # Get edges with their labels in one pass over each adjacency
         incoming_edges = [
-            {'from': pred, 'relation': graph[pred][node_id]['label']}
-            for pred in predecessors
+            {'from': pred, 'relation': label}
+            for pred, _, label in graph.in_edges(node_id, data='label', default='')
         ]
         outgoing_edges = [
-            {'to': succ, 'relation': graph[node_id][succ]['label']}
-            for succ in successors
+            {'to': succ, 'relation': label}
+            for _, succ, label in graph.out_edges(node_id, data='label', default='')
         ]
         
         return {
@@ -153,8 +209,8 @@ class GraphBuilder:
             'degree': graph.degree(node_id),
             'in_degree': graph.in_degree(node_id),
             'out_degree': graph.out_degree(node_id),
-            'num_predecessors': len(predecessors),
-            'num_successors': len(successors),
+            'num_predecessors': len(incoming_edges),
+            'num_successors': len(outgoing_edges),
             'incoming_edges': incoming_edges,
             'outgoing_edges': outgoing_edges,
         }
\ No newline at end of file
@@ -3,10 +3,15 @@ Graph data converter for transforming NetworkX graphs to Cytoscape format.
 Handles node and edge data conversion with styling information.
 """
 
-import networkx as nx
-from typing import List, Dict, Any
+from __future__ import annotations
+
+import numpy as np
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from config.settings import settings
 
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 class CytoscapeConverter:
     """Converts NetworkX graphs to Cytoscape-compatible format."""
@@ -15,13 +20,21 @@ class CytoscapeConverter:
         """Initialize the converter."""
         self.node_min_size = settings.NODE_MIN_SIZE
         self.node_max_size_factor = settings.NODE_MAX_SIZE_FACTOR
+        # node -> (id, display label, tooltip prefix), reused across conversions
+        self._node_strings = {}
     
-    def convert_graph(self, graph: nx.DiGraph) -> Dict[str, List[Dict]]:
+    def convert_graph(
+        self,
+        graph: nx.DiGraph,
+        degrees: Optional[Dict[Any, int]] = None
+    ) -> Dict[str, List[Dict]]:
         """
         Convert a NetworkX graph to Cytoscape format.
         
         Args:
             graph: NetworkX directed graph
+            degrees: Optional precomputed node degrees
+                (e.g. from GraphBuilder.get_node_degrees)
             
         Returns:
             Dictionary with 'nodes' and 'edges' lists in Cytoscape format
@@ -29,46 +42,107 @@ class CytoscapeConverter:
         if graph is None or graph.number_of_nodes() == 0:
             return {'nodes': [], 'edges': []}
         
-        nodes = self._convert_nodes(graph)
+        nodes = self._convert_nodes(graph, degrees)
         edges = self._convert_edges(graph)
         
         return {'nodes': nodes, 'edges': edges}
     
-    def _convert_nodes(self, graph: nx.DiGraph) -> List[Dict[str, Any]]:
+    def convert_graph_columnar(
+        self,
+        graph: nx.DiGraph,
+        degrees: Optional[Dict[Any, int]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Convert a NetworkX graph to column arrays (one array per field).
+        
+        Parallel arrays avoid allocating a dictionary per node and edge,
+        which keeps large graphs compact for numeric work or export. It is
+        an opt-in alternative to convert_graph(), not a step of it:
+        zipping the arrays back into Cytoscape records is slower than
+        building the records straight from the graph.
+        
+        Args:
+            graph: NetworkX directed graph
+            degrees: Optional precomputed node degrees
+                (e.g. from GraphBuilder.get_node_degrees)
+            
+        Returns:
+            Dictionary with node columns ('node_ids', 'degrees', 'sizes')
+            and edge columns ('edge_sources', 'edge_targets', 'edge_labels')
+        """
+        if graph is None:
+            node_degrees, edges = [], []
+        else:
+            # Iterate (node, degree) pairs straight from the precomputed map
+            # or the graph's degree view
+            node_degrees = degrees.items() if degrees is not None else graph.degree()
+            edges = graph.edges(data='label', default='')
+        
+        node_ids = np.array([str(node) for node, _ in node_degrees], dtype=object)
+        degree_values = np.fromiter(
+            (degree for _, degree in node_degrees), dtype=np.int64, count=len(node_ids)
+        )
+        
+        # Calculate node size based on degree
+        max_degree = int(degree_values.max()) if degree_values.size else 1
+        scale = self.node_max_size_factor / max_degree if max_degree > 0 else 0.0
+        sizes = self.node_min_size + degree_values * scale
+        
+        return {
+            'node_ids': node_ids,
+            'degrees': degree_values,
+            'sizes': sizes,
+            'edge_sources': np.array([str(u) for u, _, _ in edges], dtype=object),
+            'edge_targets': np.array([str(v) for _, v, _ in edges], dtype=object),
+            'edge_labels': np.array([label for _, _, label in edges], dtype=object),
+        }
+    
+    def _convert_nodes(
+        self,
+        graph: nx.DiGraph,
+        degrees: Optional[Dict[Any, int]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Convert NetworkX nodes to Cytoscape format.
         
         Args:
             graph: NetworkX directed graph
+            degrees: Optional precomputed node degrees
             
         Returns:
             List of node dictionaries in Cytoscape format
         """
-        nodes = []
+        # Iterate (node, degree) pairs straight from the precomputed map or
+        # the graph's degree view, without building an intermediate dict
+        node_degrees = degrees.items() if degrees is not None else graph.degree()
+        max_degree = max((degree for _, degree in node_degrees), default=1)
         
-        # Calculate degrees for sizing
-        node_degrees = dict(graph.degree())
-        max_degree = max(node_degrees.values()) if node_degrees else 1
+        # Bind sizing parameters locally; size grows linearly with degree
+        min_size = self.node_min_size
+        scale = self.node_max_size_factor / max_degree if max_degree > 0 else 0.0
         
-        for node_id in graph.nodes():
-            degree = node_degrees.get(node_id, 0)
-            
-            # Calculate node size based on degree
-            if max_degree > 0:
-                node_size = self.node_min_size + (degree / max_degree) * self.node_max_size_factor
-            else:
-                node_size = self.node_min_size
-            
-            # Create display label (wrap spaces with newlines)
-            display_label = str(node_id).replace(' ', '\n')
+        node_strings = self._node_strings
+        nodes = []
+        
+        for node, degree in node_degrees:
+            strings = node_strings.get(node)
+            if strings is None:
+                node_id = str(node)
+                # Display label wraps spaces with newlines
+                strings = node_strings[node] = (
+                    node_id,
+                    node_id.replace(' ', '\n'),
+                    f"Entity: {node_id}\nDegree: ",
+                )
+            node_id, display_label, tooltip_prefix = strings
             
             nodes.append({
                 'data': {
-                    'id': str(node_id),
+                    'id': node_id,
                     'label': display_label,
                     'degree': degree,
-                    'size': node_size,
-                    'tooltip_text': f"Entity: {str(node_id)}\nDegree: {degree}"
+                    'size': min_size + degree * scale,
+                    'tooltip_text': tooltip_prefix + str(degree)
                 }
             })
         
@@ -84,26 +158,19 @@ class CytoscapeConverter:
         Returns:
             List of edge dictionaries in Cytoscape format
         """
-        edges = []
-        edge_count = 0
-        
-        for u, v, data in graph.edges(data=True):
-            edge_id = f"edge_{edge_count}"
-            predicate_label = data.get('label', '')
-            
-            edges.append({
+        return [
+            {
                 'data': {
-                    'id': edge_id,
+                    'id': f"edge_{edge_count}",
                     'source': str(u),
                     'target': str(v),
                     'label': predicate_label,
                     'tooltip_text': f"Relationship: {predicate_label}"
                 }
-            })
-            
-            edge_count += 1
-        
-        return edges
+            }
+            for edge_count, (u, v, predicate_label)
+            in enumerate(graph.edges(data='label', default=''))
+        ]
     
     def get_conversion_statistics(
         self,
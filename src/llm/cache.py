@@ -0,0 +1,314 @@
+"""
+Persistent response caches for LLM calls.
+Stores serialized LLM responses on disk keyed by a hash of the request,
+or by the embedding of the request text for near-duplicate matching.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import settings
+
+
+class ResponseCache:
+    """SQLite-backed key-value store for LLM responses."""
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize the response cache.
+        
+        Args:
+            cache_dir: Directory holding the cache database (defaults to settings)
+            ttl: Seconds before an entry expires, 0 for never (defaults to settings)
+        """
+        self.cache_dir = os.path.expanduser(cache_dir or settings.LLM_CACHE_DIR)
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, 'llm_cache.sqlite3')
+        
+        # Async extraction may run on a worker thread, so the connection is
+        # shared across threads and guarded by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS completions '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)'
+            )
+    
+    @staticmethod
+    def make_key(request: Any) -> str:
+        """
+        Build a cache key from the parameters that determine an LLM response.
+        
+        Args:
+            request: JSON-serializable request parameters (model, messages,
+                temperature, max_tokens, ...)
+        
+        Returns:
+            SHA-256 hex digest identifying the request
+        """
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key()
+        
+        Returns:
+            Cached response text or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created FROM completions WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl and time.time() - row[1] > self.ttl:
+            self.delete(key)
+            return None
+        return row[0]
+    
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response.
+        
+        Args:
+            key: Cache key from make_key()
+            value: Response text to store
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO completions (key, value, created) VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+    
+    def delete(self, key: str) -> None:
+        """
+        Remove a single response.
+        
+        Args:
+            key: Cache key from make_key()
+        """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM completions WHERE key = ?', (key,))
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM completions')
+    
+    def __len__(self) -> int:
+        """Number of cached responses."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM completions').fetchone()[0]
+
+
+class _SemanticStore:
+    """
+    Semantic cache entries of one directory.
+    
+    Every SemanticCache using the directory shares the same store, so
+    entries from several clients in one session are saved together
+    instead of each overwriting the files with its own.
+    """
+    
+    def __init__(self, cache_dir: str):
+        self.embeddings_path = os.path.join(cache_dir, 'semantic_embeddings.npy')
+        self.entries_path = os.path.join(cache_dir, 'semantic_entries.json')
+        self.lock = threading.Lock()
+        self.embeddings: List[np.ndarray] = []
+        # Parallel to embeddings: (namespace, text key, response) per entry
+        self.entries: List[Tuple[str, str, str]] = []
+        self.matrix = None
+        self.namespaces = None
+        self.dirty = False
+        
+        if os.path.exists(self.embeddings_path) and os.path.exists(self.entries_path):
+            with open(self.entries_path, encoding='utf-8') as f:
+                self.entries = [tuple(entry) for entry in json.load(f)]
+            self.embeddings = list(np.load(self.embeddings_path))
+        
+        atexit.register(self.save)
+    
+    def save(self) -> None:
+        """Write entries changed since the last save to disk."""
+        with self.lock:
+            if not self.dirty:
+                return
+            if self.entries:
+                np.save(self.embeddings_path, np.vstack(self.embeddings))
+                with open(self.entries_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f)
+            else:
+                for path in (self.embeddings_path, self.entries_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+            self.dirty = False
+
+
+# One store per cache directory
+_STORES: Dict[str, _SemanticStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _get_store(cache_dir: str) -> _SemanticStore:
+    """Get the shared store of a cache directory, loading it on first use."""
+    key = os.path.realpath(cache_dir)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = _SemanticStore(key)
+        return store
+
+
+class SemanticCache:
+    """
+    Embedding-based cache that matches near-duplicate requests.
+    
+    Each entry stores the normalized embedding of a request's text together
+    with its response. A lookup returns the response of the most similar
+    earlier entry in the same namespace if its cosine similarity reaches the
+    threshold. Namespaces keep apart requests that differ in anything but
+    the embedded text (model, parameters, system prompt). Caches using the
+    same directory share their entries.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        model_name: Optional[str] = None,
+        threshold: Optional[float] = None
+    ):
+        """
+        Initialize the semantic cache, loading entries saved by earlier runs.
+        
+        Args:
+            cache_dir: Directory holding the cache files (defaults to settings)
+            model_name: sentence-transformers model used for embeddings
+                (defaults to settings)
+            threshold: Minimum cosine similarity for a hit (defaults to settings)
+        """
+        self.cache_dir = os.path.expanduser(cache_dir or settings.LLM_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.model_name = model_name or settings.LLM_SEMANTIC_CACHE_MODEL
+        self.threshold = threshold if threshold is not None else settings.LLM_SEMANTIC_CACHE_THRESHOLD
+        self._model = None
+        self._store = _get_store(self.cache_dir)
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed text as a unit-length float32 vector."""
+        if self._model is None:
+            # Heavy optional dependency, only needed when the cache is enabled
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+    
+    def lookup(self, namespace: str, text: str) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        Find the response of the most similar earlier request.
+        
+        Args:
+            namespace: Key for everything about the request except ``text``
+            text: Text whose embedding is compared
+        
+        Returns:
+            Tuple of (embedding of ``text``, cached response or None on a
+            miss); pass the embedding to add() after a miss
+        """
+        embedding = self._embed(text)
+        store = self._store
+        with store.lock:
+            best = self._best_match(namespace, embedding)
+            if best is not None:
+                return embedding, store.entries[best][2]
+        return embedding, None
+    
+    def _best_match(self, namespace: str, embedding: np.ndarray) -> Optional[int]:
+        """
+        Find the most similar entry in a namespace; the caller holds the store lock.
+        
+        Returns:
+            Index of the entry, or None if no entry reaches the threshold
+        """
+        store = self._store
+        if not store.entries:
+            return None
+        if store.matrix is None:
+            store.matrix = np.vstack(store.embeddings)
+            store.namespaces = np.array([entry[0] for entry in store.entries])
+        
+        # Inner product of unit vectors is cosine similarity
+        scores = store.matrix @ embedding
+        scores[store.namespaces != namespace] = -np.inf
+        best = int(np.argmax(scores))
+        return best if scores[best] >= self.threshold else None
+    
+    def add(self, namespace: str, text: str, embedding: np.ndarray, value: str) -> None:
+        """
+        Store a response.
+        
+        Args:
+            namespace: Key for everything about the request except ``text``
+            text: Text the embedding was computed from
+            embedding: Embedding returned by lookup()
+            value: Response text to store
+        """
+        store = self._store
+        with store.lock:
+            store.embeddings.append(embedding)
+            store.entries.append((namespace, ResponseCache.make_key(text), value))
+            store.matrix = None
+            store.dirty = True
+    
+    def delete(self, namespace: str, text: str) -> None:
+        """
+        Remove the responses stored for this text and the response a
+        lookup of it would return, which may belong to a near-duplicate.
+        
+        Args:
+            namespace: Key for everything about the request except ``text``
+            text: Text the response was stored under or looked up with
+        """
+        text_key = ResponseCache.make_key(text)
+        embedding = self._embed(text)
+        store = self._store
+        with store.lock:
+            matched = self._best_match(namespace, embedding)
+            keep = [
+                i for i, entry in enumerate(store.entries)
+                if i != matched and (entry[0] != namespace or entry[1] != text_key)
+            ]
+            if len(keep) == len(store.entries):
+                return
+            store.embeddings = [store.embeddings[i] for i in keep]
+            store.entries = [store.entries[i] for i in keep]
+            store.matrix = None
+            store.dirty = True
+    
+    def save(self) -> None:
+        """Write entries added since the last save to disk."""
+        self._store.save()
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        store = self._store
+        with store.lock:
+            store.embeddings = []
+            store.entries = []
+            store.matrix = None
+            store.dirty = True
+        store.save()
+    
+    def __len__(self) -> int:
+        """Number of cached responses."""
+        return len(self._store.entries)
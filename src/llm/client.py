@@ -3,9 +3,108 @@ LLM Client for interacting with OpenAI-compatible APIs.
 Handles API calls, error handling, and response processing.
 """
 
+import asyncio
+import json
+import random
+import time
+from collections import OrderedDict
 import openai
-from typing import Optional, Dict, Any
+from openai.types.chat import ChatCompletion
+from typing import Optional, Dict, Any, AsyncIterator, List, Sequence, Tuple
 from config.settings import settings
+from src.llm.cache import ResponseCache, SemanticCache
+from src.llm.prompts import PromptTemplates
+
+# Prefer orjson for parsing model output; fall back to the standard library
+try:
+    import orjson as _json_backend
+except ImportError:
+    _json_backend = json
+
+# Above this temperature responses are sampled, so caching them would
+# silently replace fresh samples with a stale one
+_CACHE_MAX_TEMPERATURE = 0.2
+
+# Extraction prompts describe a JSON schema only, so JSON mode is the default;
+# pass response_format={"type": "text"} for free-form output
+_DEFAULT_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Errors worth retrying: rate limits and transient server/network failures
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class _TokenBucket:
+    """Token bucket that refills continuously up to a per-minute capacity."""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.refill_rate = per_minute / 60.0
+        self.updated = time.monotonic()
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        
+        # A single request larger than the bucket would otherwise never fit
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+    
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` tokens from the bucket."""
+        self.tokens -= min(amount, self.capacity)
+
+
+class _RateLimiter:
+    """
+    Client-side requests-per-minute and tokens-per-minute limiter.
+    
+    The buckets outlive any one event loop, so a limiter can be shared by
+    every batch an LLMClient sends; the lock serializing waiters is
+    recreated whenever the running loop changes.
+    """
+    
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self._requests = _TokenBucket(rpm) if rpm else None
+        self._tokens = _TokenBucket(tpm) if tpm else None
+        self._lock = None
+        self._lock_loop = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """Get a lock bound to the currently running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request of ``tokens`` estimated tokens may be sent."""
+        buckets = [
+            (bucket, amount)
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens))
+            if bucket is not None
+        ]
+        if not buckets:
+            return
+        
+        # Waiters are served one at a time, in arrival order
+        async with self._get_lock():
+            while True:
+                delay = max(bucket.wait_time(amount) for bucket, amount in buckets)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            for bucket, amount in buckets:
+                bucket.consume(amount)
 
 
 class LLMClient:
@@ -18,6 +117,7 @@ class LLMClient:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        use_cache: Optional[bool] = None,
     ):
         """
         Initialize the LLM client.
@@ -28,12 +128,20 @@ class LLMClient:
             model: Model name to use (defaults to settings)
             temperature: Sampling temperature (defaults to settings)
             max_tokens: Maximum tokens in response (defaults to settings)
+            use_cache: Whether to reuse responses for identical requests
+                (defaults to settings; always off above temperature 0.2)
         """
         self.api_key = api_key or settings.OPENAI_API_KEY
         self.base_url = base_url or settings.OPENAI_API_BASE
         self.model = model or settings.LLM_MODEL_NAME
         self.temperature = temperature if temperature is not None else settings.LLM_TEMPERATURE
         self.max_tokens = max_tokens or settings.LLM_MAX_TOKENS
+        self.max_retries = settings.LLM_MAX_RETRIES
+        if settings.LLM_PROMPT_CACHE_CONTROL == "auto":
+            self.prompt_cache_control = "anthropic" in (self.base_url or "").lower()
+        else:
+            self.prompt_cache_control = settings.LLM_PROMPT_CACHE_CONTROL == "true"
+        self.retry_base_delay = settings.LLM_RETRY_BASE_DELAY
         
         # Validate API key
         if not self.api_key:
@@ -47,8 +155,86 @@ class LLMClient:
             api_key=self.api_key,
             base_url=self.base_url
         )
+        
+        # Async client is created lazily, bound to the running event loop
+        self._async_client = None
+        self._async_loop = None
+        
+        # Two-tier response cache: an in-memory LRU in front of the disk store
+        if use_cache is None:
+            use_cache = settings.LLM_CACHE_ENABLED
+        self.cache_enabled = use_cache and self.temperature <= _CACHE_MAX_TEMPERATURE
+        self.cache = ResponseCache() if self.cache_enabled else None
+        self._memory_cache = OrderedDict()
+        self._memory_cache_size = settings.LLM_CACHE_MEMORY_SIZE
+        
+        # Optional third tier matching near-duplicate requests by embedding
+        self.semantic_cache = (
+            SemanticCache()
+            if self.cache_enabled and settings.LLM_SEMANTIC_CACHE_ENABLED else None
+        )
+        self._cache_stats = {"memory_hits": 0, "disk_hits": 0, "semantic_hits": 0, "misses": 0}
+        
+        # Rate limiters by (rpm, tpm), shared by all batches of this client
+        self._rate_limiters: Dict[Tuple[int, int], _RateLimiter] = {}
     
-    def chat_completion(
+    def _get_rate_limiter(self, rpm: Optional[int], tpm: Optional[int]) -> _RateLimiter:
+        """
+        Get the limiter for the given per-minute limits.
+        
+        Args:
+            rpm: Requests per minute limit, 0 for none (defaults to settings)
+            tpm: Tokens per minute limit, 0 for none (defaults to settings)
+            
+        Returns:
+            Limiter shared by every request made with these limits
+        """
+        limits = (
+            rpm if rpm is not None else settings.LLM_RPM,
+            tpm if tpm is not None else settings.LLM_TPM
+        )
+        limiter = self._rate_limiters.get(limits)
+        if limiter is None:
+            limiter = self._rate_limiters[limits] = _RateLimiter(*limits)
+        return limiter
+    
+    def _get_async_client(self) -> openai.AsyncOpenAI:
+        """
+        Get an async client bound to the currently running event loop.
+        
+        The underlying HTTP connection pool cannot be shared between event
+        loops, so a new client is created whenever the loop changes (e.g.
+        on every ``asyncio.run`` call).
+        
+        Returns:
+            AsyncOpenAI client for the running loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            # Retries are handled by _create_with_retry
+            self._async_client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0
+            )
+            self._async_loop = loop
+        return self._async_client
+    
+    async def aclose(self) -> None:
+        """
+        Close the async client of the running event loop.
+        
+        Call before an event loop that made async requests ends (e.g. at the
+        end of the coroutine passed to ``asyncio.run``) so its connection
+        pool is released; later async requests create a new client.
+        """
+        client = self._async_client
+        self._async_client = None
+        self._async_loop = None
+        if client is not None:
+            await client.close()
+    
+    def _build_request_params(
         self,
         system_prompt: str,
         user_prompt: str,
@@ -56,23 +242,20 @@ class LLMClient:
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Make a chat completion request to the LLM.
+        Build the parameters for a chat completion request.
         
         Args:
             system_prompt: System message setting the context/role
             user_prompt: User message with the actual request
-            response_format: Optional response format specification
+            response_format: Response format specification (defaults to JSON mode)
             **kwargs: Additional parameters to pass to the API
             
         Returns:
-            Dictionary containing the full API response
-            
-        Raises:
-            Exception: If the API call fails
+            Dictionary of request parameters
         """
         messages = [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
+            {"role": "user", "content": self._user_content(user_prompt)}
         ]
         
         # Build request parameters
@@ -83,18 +266,382 @@ class LLMClient:
             "max_tokens": self.max_tokens,
         }
         
-        # Add response format if specified
-        if response_format:
-            request_params["response_format"] = response_format
+        # JSON mode unless the caller asks for another format
+        request_params["response_format"] = response_format or _DEFAULT_RESPONSE_FORMAT
         
         # Add any additional parameters
         request_params.update(kwargs)
         
+        return request_params
+    
+    def _user_content(self, user_prompt: str) -> Any:
+        """
+        Build the user message content.
+        
+        With prompt cache control enabled, a prompt that starts with one of
+        the shared extraction prefixes (single-chunk or packed) is sent as
+        two text parts, the prefix marked ``cache_control: ephemeral`` so
+        the provider can cache it.
+        
+        Args:
+            user_prompt: User message with the actual request
+            
+        Returns:
+            The prompt string, or a list of content parts
+        """
+        if not self.prompt_cache_control:
+            return user_prompt
+        for prefix in (PromptTemplates.USER_PROMPT_PREFIX, PromptTemplates.PACKED_USER_PROMPT_PREFIX):
+            if user_prompt.startswith(prefix):
+                return [
+                    {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": user_prompt[len(prefix):]},
+                ]
+        return user_prompt
+    
+    def _cache_lookup(
+        self,
+        request_params: Dict[str, Any],
+        semantic_key: Optional[str] = None
+    ) -> Tuple[Optional[tuple], Any]:
+        """
+        Look up a cached response for a request.
+        
+        Args:
+            request_params: Parameters from _build_request_params()
+            semantic_key: Text to match near-duplicates on in the semantic
+                cache (skipped if None)
+            
+        Returns:
+            Tuple of (cache slot to pass to _cache_store(), cached response);
+            the slot is None when caching is disabled and the response is
+            None on a miss
+        """
+        if not self.cache_enabled:
+            return None, None
+        
+        key = ResponseCache.make_key(request_params)
+        response = self._memory_cache.get(key)
+        if response is not None:
+            self._memory_cache.move_to_end(key)
+            self._cache_stats["memory_hits"] += 1
+            return (key, None), response
+        
+        value = self.cache.get(key)
+        if value is not None:
+            response = ChatCompletion.model_validate_json(value)
+            self._remember(key, response)
+            self._cache_stats["disk_hits"] += 1
+            return (key, None), response
+        
+        semantic = None
+        if self.semantic_cache is not None and semantic_key is not None:
+            namespace = self._semantic_namespace(request_params)
+            embedding, value = self.semantic_cache.lookup(namespace, semantic_key)
+            if value is not None:
+                self._cache_stats["semantic_hits"] += 1
+                return (key, None), ChatCompletion.model_validate_json(value)
+            semantic = (namespace, semantic_key, embedding)
+        
+        self._cache_stats["misses"] += 1
+        return (key, semantic), None
+    
+    @staticmethod
+    def _semantic_namespace(request_params: Dict[str, Any]) -> str:
+        """Key a request by everything except its final (user) message."""
+        return ResponseCache.make_key(
+            {**request_params, "messages": request_params["messages"][:-1]}
+        )
+    
+    def _remember(self, key: str, response: Any) -> None:
+        """Add a response to the in-memory tier, evicting the least recently used."""
+        self._memory_cache[key] = response
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > self._memory_cache_size:
+            self._memory_cache.popitem(last=False)
+    
+    def _cache_store(self, slot: Optional[tuple], response: Any) -> None:
+        """Store a fresh API response in every cache tier."""
+        if slot is None:
+            return
+        key, semantic = slot
+        value = response.model_dump_json()
+        self._remember(key, response)
+        self.cache.set(key, value)
+        if semantic is not None:
+            namespace, semantic_key, embedding = semantic
+            self.semantic_cache.add(namespace, semantic_key, embedding, value)
+    
+    def discard_cached(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Dict[str, str]] = None,
+        semantic_key: Optional[str] = None,
+        **kwargs
+    ) -> None:
+        """
+        Drop the cached response for a request, e.g. one whose output
+        could not be used, so the next identical call hits the API again.
+        
+        Args:
+            system_prompt: System message of the request
+            user_prompt: User message of the request
+            response_format: Response format of the request
+            semantic_key: Semantic cache text the request was made with; the
+                near-duplicate entry it was served from is dropped as well
+            **kwargs: Additional parameters of the request
+        """
+        if not self.cache_enabled:
+            return
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, response_format, **kwargs
+        )
+        key = ResponseCache.make_key(request_params)
+        self._memory_cache.pop(key, None)
+        self.cache.delete(key)
+        if self.semantic_cache is not None and semantic_key is not None:
+            self.semantic_cache.delete(self._semantic_namespace(request_params), semantic_key)
+    
+    def clear_cache(self) -> None:
+        """Remove all cached responses from memory and disk."""
+        self._memory_cache.clear()
+        if self.cache is not None:
+            self.cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache statistics for this client.
+        
+        Returns:
+            Dictionary with hit/miss counts and the overall hit rate
+        """
+        hits = (
+            self._cache_stats["memory_hits"]
+            + self._cache_stats["disk_hits"]
+            + self._cache_stats["semantic_hits"]
+        )
+        lookups = hits + self._cache_stats["misses"]
+        return {
+            "enabled": self.cache_enabled,
+            **self._cache_stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+    
+    def chat_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Dict[str, str]] = None,
+        semantic_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Make a chat completion request to the LLM.
+        
+        Identical requests are served from the response cache when enabled.
+        
+        Args:
+            system_prompt: System message setting the context/role
+            user_prompt: User message with the actual request
+            response_format: Response format specification (defaults to JSON mode)
+            semantic_key: Text to match near-duplicate requests on when the
+                semantic cache is enabled (e.g. the chunk being processed)
+            **kwargs: Additional parameters to pass to the API
+            
+        Returns:
+            Dictionary containing the full API response
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, response_format, **kwargs
+        )
+        
+        cache_slot, response = self._cache_lookup(request_params, semantic_key)
+        if response is not None:
+            return response
+        
         try:
             response = self.client.chat.completions.create(**request_params)
+        except Exception as e:
+            raise Exception(f"LLM API call failed: {str(e)}")
+        
+        self._cache_store(cache_slot, response)
+        return response
+    
+    async def chat_completion_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Dict[str, str]] = None,
+        semantic_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Make a chat completion request to the LLM without blocking the event loop.
+        
+        Identical requests are served from the response cache when enabled.
+        Transient failures (rate limits, connection and server errors) are
+        retried with exponential backoff.
+        
+        Args:
+            system_prompt: System message setting the context/role
+            user_prompt: User message with the actual request
+            response_format: Response format specification (defaults to JSON mode)
+            semantic_key: Text to match near-duplicate requests on when the
+                semantic cache is enabled (e.g. the chunk being processed)
+            **kwargs: Additional parameters to pass to the API
+            
+        Returns:
+            Dictionary containing the full API response
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, response_format, **kwargs
+        )
+        
+        cache_slot, response = self._cache_lookup(request_params, semantic_key)
+        if response is not None:
             return response
+        
+        return await self._request_async(request_params, cache_slot)
+    
+    async def _request_async(
+        self,
+        request_params: Dict[str, Any],
+        cache_slot: Optional[tuple]
+    ) -> Any:
+        """Send a request that missed the cache and store the response."""
+        try:
+            response = await self._create_with_retry(request_params)
         except Exception as e:
             raise Exception(f"LLM API call failed: {str(e)}")
+        
+        self._cache_store(cache_slot, response)
+        return response
+    
+    async def _create_with_retry(self, request_params: Dict[str, Any]) -> Any:
+        """
+        Send a chat completion request, retrying transient failures.
+        
+        Rate limit, connection and server errors are retried up to
+        max_retries times with exponential backoff plus random jitter.
+        
+        Args:
+            request_params: Parameters from _build_request_params()
+            
+        Returns:
+            The API response
+        """
+        client = self._get_async_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await client.chat.completions.create(**request_params)
+            except _RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_base_delay * 2 ** attempt
+                await asyncio.sleep(delay + random.uniform(0, delay))
+    
+    async def iter_chat_completions(
+        self,
+        prompts: Sequence[Tuple[str, str]],
+        concurrency: Optional[int] = None,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        semantic_keys: Optional[Sequence[str]] = None,
+        **kwargs
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Make many chat completion requests concurrently, yielding each
+        response as soon as it arrives.
+        
+        Cached requests are answered immediately. Of the rest, at most
+        ``concurrency`` are in flight at once, and requests are held back
+        as needed to stay under the per-minute limits, which apply across
+        all calls on this client. Token usage is estimated from prompt
+        length (about four characters per token).
+        
+        Args:
+            prompts: Sequence of (system_prompt, user_prompt) pairs
+            concurrency: Maximum requests in flight (defaults to settings)
+            rpm: Requests per minute limit, 0 for none (defaults to settings)
+            tpm: Tokens per minute limit, 0 for none (defaults to settings)
+            response_format: Response format specification (defaults to JSON mode)
+            semantic_keys: Optional semantic cache text for each prompt pair
+            **kwargs: Additional parameters to pass to the API
+            
+        Yields:
+            (index, result) tuples in completion order, where index is the
+            position of the prompt pair and result is the API response or
+            the exception raised for that request
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.LLM_MAX_CONCURRENCY)
+        limiter = self._get_rate_limiter(rpm, tpm)
+        
+        if semantic_keys is None:
+            semantic_keys = [None] * len(prompts)
+        
+        async def complete(
+            index: int,
+            system_prompt: str,
+            user_prompt: str,
+            semantic_key: Optional[str]
+        ) -> Tuple[int, Any]:
+            try:
+                request_params = self._build_request_params(
+                    system_prompt, user_prompt, response_format, **kwargs
+                )
+                cache_slot, response = self._cache_lookup(request_params, semantic_key)
+                if response is not None:
+                    return index, response
+                
+                async with semaphore:
+                    await limiter.acquire((len(system_prompt) + len(user_prompt)) // 4)
+                    return index, await self._request_async(request_params, cache_slot)
+            except Exception as e:
+                return index, e
+        
+        tasks = [
+            asyncio.ensure_future(complete(index, system_prompt, user_prompt, semantic_key))
+            for index, ((system_prompt, user_prompt), semantic_key)
+            in enumerate(zip(prompts, semantic_keys))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding requests if the consumer stops early
+            for task in tasks:
+                task.cancel()
+    
+    async def chat_completions_batch(
+        self,
+        prompts: Sequence[Tuple[str, str]],
+        **kwargs
+    ) -> List[Any]:
+        """
+        Make many chat completion requests concurrently.
+        
+        Args:
+            prompts: Sequence of (system_prompt, user_prompt) pairs
+            **kwargs: Options and API parameters as for iter_chat_completions()
+            
+        Returns:
+            List with one entry per prompt pair, in input order: the API
+            response, or the exception raised for that request
+        """
+        results = [None] * len(prompts)
+        async for index, result in self.iter_chat_completions(prompts, **kwargs):
+            results[index] = result
+        return results
     
     def extract_content(self, response: Any) -> str:
         """
@@ -111,6 +658,44 @@ class LLMClient:
         except (AttributeError, IndexError) as e:
             raise ValueError(f"Failed to extract content from response: {str(e)}")
     
+    def extract_json(self, response: Any) -> List[Dict[str, Any]]:
+        """
+        Extract the JSON array of triples from an API response.
+        
+        JSON mode responses are {"triples": [...]} objects, and a bare array
+        is returned as parsed. Other content falls back to the array between
+        the outermost brackets, so stray text around it is tolerated.
+        
+        Args:
+            response: The API response object
+            
+        Returns:
+            The parsed list
+            
+        Raises:
+            ValueError: If the content holds no parseable JSON array
+        """
+        content = self.extract_content(response)
+        try:
+            parsed = _json_backend.loads(content)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, list):
+            return parsed
+        if isinstance(parsed, dict) and isinstance(parsed.get("triples"), list):
+            return parsed["triples"]
+        
+        start = content.find('[')
+        end = content.rfind(']')
+        if start == -1 or end < start:
+            raise ValueError("No JSON array found in response content")
+        
+        # orjson's errors subclass ValueError, like the standard library's
+        parsed = _json_backend.loads(content[start:end + 1])
+        if not isinstance(parsed, list):
+            raise ValueError("Response content is not a JSON array")
+        return parsed
+    
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get current model configuration.
@@ -3,10 +3,85 @@ Prompt templates for LLM-based knowledge graph extraction.
 Contains system and user prompts for extracting SPO triples.
 """
 
+from typing import Sequence
+
+
+_SYSTEM_PROMPT = """
+You are an AI expert specialized in knowledge graph extraction. 
+Your task is to identify and extract factual Subject-Predicate-Object (SPO) triples from the given text.
+Focus on accuracy and adhere strictly to the JSON schema given in the user prompt.
+Extract core entities and the most direct relationship.
+"""
+
+# Extraction rules shared by the single-chunk and packed prompts
+_RULES = """
+**VERY IMPORTANT RULES:**
+1.  **Concise Predicates:** Keep the 'predicate' value concise (1-3 words, ideally 1-2). Use verbs or short verb phrases (e.g., 'discovered', 'was born in', 'won').
+2.  **Lowercase:** ALL values for 'subject', 'predicate', and 'object' MUST be lowercase.
+3.  **Pronoun Resolution:** Replace pronouns (she, he, it, her, etc.) with the specific lowercase entity name they refer to based on the text context (e.g., 'marie curie').
+4.  **Specificity:** Capture specific details (e.g., 'nobel prize in physics' instead of just 'nobel prize' if specified).
+5.  **Completeness:** Extract all distinct factual relationships mentioned.
+"""
+
+# The user prompt is a fixed prefix (instructions, rules and format
+# example) followed by the chunk and a short fixed suffix. Keeping the
+# variable text last leaves the prefix byte-identical across requests,
+# so provider-side prompt caches can reuse it.
+_USER_PROMPT_PREFIX = """
+Please extract Subject-Predicate-Object (S-P-O) triples from the text at the end of this message.
+
+Respond with a JSON object whose "triples" key holds an array of objects with keys "subject", "predicate", "object".
+""" + _RULES + """
+**Example:**
+{"triples": [
+  { "subject": "marie curie", "predicate": "discovered", "object": "radium" },
+  { "subject": "marie curie", "predicate": "won", "object": "nobel prize in physics" }
+]}
+
+---
+**Text to Process:**
+```text
+"""
+
+_USER_PROMPT_SUFFIX = """
+```
+"""
+
+# Packed variant: several chunks in one request, each introduced by its
+# position in brackets, answered with one array of triples per position
+_PACKED_USER_PROMPT_PREFIX = """
+Please extract Subject-Predicate-Object (S-P-O) triples from each of the numbered passages at the end of this message. Each passage starts with its number in brackets, e.g. [1].
+
+Respond with a JSON object that maps each passage number (as a string) to an array of objects with keys "subject", "predicate", "object". Treat every passage on its own and use an empty array for a passage without facts.
+""" + _RULES + """
+**Example:**
+{"1": [
+  { "subject": "marie curie", "predicate": "discovered", "object": "radium" }
+], "2": [
+  { "subject": "marie curie", "predicate": "won", "object": "nobel prize in physics" }
+]}
+
+---
+**Passages to Process:**
+```text
+"""
+
+# str.format template equivalent to prefix + chunk + suffix
+_USER_TEMPLATE = (
+    _USER_PROMPT_PREFIX.replace('{', '{{').replace('}', '}}')
+    + '{text_chunk}'
+    + _USER_PROMPT_SUFFIX
+)
+
 
 class PromptTemplates:
     """Collection of prompt templates for knowledge graph extraction."""
     
+    # Shared prefix and suffix of every user prompt (see format_user_prompt)
+    USER_PROMPT_PREFIX = _USER_PROMPT_PREFIX
+    USER_PROMPT_SUFFIX = _USER_PROMPT_SUFFIX
+    PACKED_USER_PROMPT_PREFIX = _PACKED_USER_PROMPT_PREFIX
+    
     @staticmethod
     def get_system_prompt() -> str:
         """
@@ -15,12 +90,7 @@ class PromptTemplates:
         Returns:
             System prompt string
         """
-        return """
-You are an AI expert specialized in knowledge graph extraction. 
-Your task is to identify and extract factual Subject-Predicate-Object (SPO) triples from the given text.
-Focus on accuracy and adhere strictly to the JSON output format requested in the user prompt.
-Extract core entities and the most direct relationship.
-"""
+        return _SYSTEM_PROMPT
     
     @staticmethod
     def get_user_prompt_template() -> str:
@@ -30,31 +100,7 @@ Extract core entities and the most direct relationship.
         Returns:
             User prompt template string with {text_chunk} placeholder
         """
-        return """
-Please extract Subject-Predicate-Object (S-P-O) triples from the text below.
-
-**VERY IMPORTANT RULES:**
-1.  **Output Format:** Respond ONLY with a single, valid JSON array. Each element MUST be an object with keys "subject", "predicate", "object".
-2.  **JSON Only:** Do NOT include any text before or after the JSON array (e.g., no 'Here is the JSON:' or explanations). Do NOT use markdown ```json ... ``` tags.
-3.  **Concise Predicates:** Keep the 'predicate' value concise (1-3 words, ideally 1-2). Use verbs or short verb phrases (e.g., 'discovered', 'was born in', 'won').
-4.  **Lowercase:** ALL values for 'subject', 'predicate', and 'object' MUST be lowercase.
-5.  **Pronoun Resolution:** Replace pronouns (she, he, it, her, etc.) with the specific lowercase entity name they refer to based on the text context (e.g., 'marie curie').
-6.  **Specificity:** Capture specific details (e.g., 'nobel prize in physics' instead of just 'nobel prize' if specified).
-7.  **Completeness:** Extract all distinct factual relationships mentioned.
-
-**Text to Process:**
-```text
-{text_chunk}
-```
-
-**Required JSON Output Format Example:**
-[
-  {{ "subject": "marie curie", "predicate": "discovered", "object": "radium" }},
-  {{ "subject": "marie curie", "predicate": "won", "object": "nobel prize in physics" }}
-]
-
-**Your JSON Output (MUST start with '[' and end with ']'):**
-"""
+        return _USER_TEMPLATE
     
     @staticmethod
     def format_user_prompt(text_chunk: str) -> str:
@@ -65,10 +111,9 @@ Please extract Subject-Predicate-Object (S-P-O) triples from the text below.
             text_chunk: The text to extract triples from
             
         Returns:
-            Formatted user prompt
+            Formatted user prompt (the shared prefix, the chunk, the suffix)
         """
-        template = PromptTemplates.get_user_prompt_template()
-        return template.format(text_chunk=text_chunk)
+        return _USER_PROMPT_PREFIX + text_chunk + _USER_PROMPT_SUFFIX
     
     @staticmethod
     def get_prompts_for_chunk(text_chunk: str) -> tuple[str, str]:
@@ -81,6 +126,24 @@ Please extract Subject-Predicate-Object (S-P-O) triples from the text below.
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_prompt = PromptTemplates.get_system_prompt()
-        user_prompt = PromptTemplates.format_user_prompt(text_chunk)
-        return system_prompt, user_prompt
\ No newline at end of file
+        return _SYSTEM_PROMPT, _USER_PROMPT_PREFIX + text_chunk + _USER_PROMPT_SUFFIX
+    
+    @staticmethod
+    def get_prompts_for_passages(passages: Sequence[str]) -> tuple[str, str]:
+        """
+        Get system and user prompts for several text chunks packed into one
+        request.
+        
+        Passages are numbered from 1 in the given order; the response maps
+        each number, as a string, to that passage's triples.
+        
+        Args:
+            passages: The texts to extract triples from
+            
+        Returns:
+            Tuple of (system_prompt, user_prompt)
+        """
+        numbered = '\n\n'.join(
+            f'[{number}] {passage}' for number, passage in enumerate(passages, 1)
+        )
+        return _SYSTEM_PROMPT, _PACKED_USER_PROMPT_PREFIX + numbered + _USER_PROMPT_SUFFIX
\ No newline at end of file
@@ -3,7 +3,7 @@ Text processing utilities.
 Handles text chunking and normalization.
 """
 
-from .chunker import TextChunker
+from .chunker import Chunk, TextChunker
 from .normalizer import TripleNormalizer
 
-__all__ = ['TextChunker', 'TripleNormalizer']
+__all__ = ['Chunk', 'TextChunker', 'TripleNormalizer']
@@ -3,9 +3,32 @@ Text chunking utilities for splitting large texts into manageable pieces.
 Implements word-based chunking with overlap to preserve context.
 """
 
-from typing import List, Dict
+from typing import Any, Dict, List, NamedTuple, Sequence
 from config.settings import settings
 
+# Chunks cover each word about chunk_size / (chunk_size - overlap) times.
+# From this factor on, slicing one joined text beats joining every chunk.
+_SLICE_REDUNDANCY = 3
+
+
+class Chunk(NamedTuple):
+    """A slice of the input text and its position in the word sequence."""
+    
+    text: str
+    chunk_number: int
+    start_word: int
+    end_word: int
+    word_count: int
+    
+    def asdict(self) -> Dict[str, Any]:
+        """
+        Convert the chunk to a plain dictionary.
+        
+        Returns:
+            Dictionary keyed by field name
+        """
+        return self._asdict()
+
 
 class TextChunker:
     """Handles splitting text into chunks with configurable size and overlap."""
@@ -28,7 +51,7 @@ class TextChunker:
                 f"chunk size ({self.chunk_size})."
             )
     
-    def chunk_text(self, text: str) -> List[Dict[str, any]]:
+    def chunk_text(self, text: str) -> List[Chunk]:
         """
         Split text into overlapping chunks.
         
@@ -36,11 +59,12 @@ class TextChunker:
             text: The text to split into chunks
             
         Returns:
-            List of dictionaries containing chunk information:
+            List of Chunk records:
             - text: The chunk text
             - chunk_number: Sequential chunk number (1-indexed)
             - start_word: Starting word index in original text
             - end_word: Ending word index in original text
+            - word_count: Number of words in the chunk
         """
         # Split text into words
         words = text.split()
@@ -49,50 +73,72 @@ class TextChunker:
         if total_words == 0:
             return []
         
-        chunks = []
-        start_index = 0
-        chunk_number = 1
+        # A chunk starts every (chunk_size - overlap) words and is clipped
+        # to the end of the text. The step is at least one word so chunking
+        # always makes progress.
+        step = max(self.chunk_size - self.overlap, 1)
+        starts = range(0, total_words, step)
+        ends = [min(start_index + self.chunk_size, total_words) for start_index in starts]
         
-        while start_index < total_words:
-            # Calculate end index for this chunk
-            end_index = min(start_index + self.chunk_size, total_words)
-            
-            # Extract chunk text
-            chunk_text = " ".join(words[start_index:end_index])
-            
-            # Store chunk information
-            chunks.append({
-                "text": chunk_text,
-                "chunk_number": chunk_number,
-                "start_word": start_index,
-                "end_word": end_index - 1,
-                "word_count": end_index - start_index,
-            })
-            
-            # Calculate start of next chunk
-            next_start_index = start_index + self.chunk_size - self.overlap
-            
-            # Ensure we make progress (safety check)
-            if next_start_index <= start_index:
-                if end_index == total_words:
-                    break  # Already processed the last part
-                next_start_index = start_index + 1
-            
-            start_index = next_start_index
-            chunk_number += 1
-            
-            # Safety break to prevent infinite loops
-            if chunk_number > total_words:
-                break
+        # Extract chunk texts. With modest overlap, joining each chunk's words
+        # is cheapest; with heavy overlap, join once and slice every chunk
+        # out of the joined text instead of copying each word many times.
+        if self.chunk_size >= _SLICE_REDUNDANCY * step:
+            texts = self._slice_texts(words, starts, ends)
+        else:
+            texts = [
+                " ".join(words[start_index:end_index])
+                for start_index, end_index in zip(starts, ends)
+            ]
+        
+        chunks = [
+            Chunk(text, chunk_number, start_index, end_index - 1, end_index - start_index)
+            for chunk_number, (text, start_index, end_index)
+            in enumerate(zip(texts, starts, ends), start=1)
+        ]
         
         return chunks
     
-    def get_chunk_statistics(self, chunks: List[Dict[str, any]]) -> Dict[str, any]:
+    @staticmethod
+    def _slice_texts(words: List[str], starts: Sequence[int], ends: Sequence[int]) -> List[str]:
+        """
+        Build chunk texts as slices of the space-joined words.
+        
+        Args:
+            words: Words of the text
+            starts: First word index of each chunk
+            ends: One past the last word index of each chunk
+            
+        Returns:
+            Chunk texts, identical to joining each chunk's words
+        """
+        # Only needed for heavily overlapping chunks, so imported on first use
+        import numpy as np
+        
+        joined = " ".join(words)
+        
+        # Words contain no whitespace, so every space in the joined text is
+        # a separator. UTF-32 has one unit per character, which turns the
+        # separator search into a single vectorized comparison.
+        units = np.frombuffer(joined.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        word_offsets = np.empty(len(words) + 1, dtype=np.int64)
+        word_offsets[0] = 0
+        word_offsets[1:-1] = np.flatnonzero(units == ord(' ')) + 1
+        word_offsets[-1] = len(joined) + 1
+        
+        return [
+            joined[start:end]
+            for start, end in zip(
+                word_offsets[list(starts)].tolist(), (word_offsets[ends] - 1).tolist()
+            )
+        ]
+    
+    def get_chunk_statistics(self, chunks: List[Chunk]) -> Dict[str, any]:
         """
         Get statistics about the chunks.
         
         Args:
-            chunks: List of chunk dictionaries
+            chunks: List of Chunk records
             
         Returns:
             Dictionary with statistics
@@ -106,7 +152,7 @@ class TextChunker:
                 "max_words": 0,
             }
         
-        word_counts = [chunk["word_count"] for chunk in chunks]
+        word_counts = [chunk.word_count for chunk in chunks]
         
         return {
             "total_chunks": len(chunks),
@@ -3,97 +3,116 @@ Text normalization utilities for cleaning and standardizing extracted data.
 Handles lowercase conversion, whitespace normalization, and deduplication.
 """
 
-import re
-from typing import List, Dict, Set, Tuple
+import sys
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Union
+from src.extraction.validator import Triple, TripleStore
 
 
 class TripleNormalizer:
     """Normalizes and deduplicates extracted SPO triples."""
     
-    def __init__(self):
-        """Initialize the normalizer."""
+    def __init__(self, keep_seen_triples: bool = False):
+        """
+        Initialize the normalizer.
+        
+        Args:
+            keep_seen_triples: Also record every unique (subject, predicate,
+                object) key in seen_triples, for debugging. Deduplication
+                itself only needs their hashes.
+        """
+        self.keep_seen_triples = keep_seen_triples
         self.seen_triples: Set[Tuple[str, str, str]] = set()
+        self._seen_hashes: Set[int] = set()
         self.empty_removed_count = 0
         self.duplicates_removed_count = 0
     
-    def normalize_triple(self, triple: Dict[str, any]) -> Dict[str, str]:
+    def normalize_triple(
+        self,
+        triple: Union[Triple, Dict[str, Any]]
+    ) -> Optional[Triple]:
         """
         Normalize a single triple.
         
         Args:
-            triple: Dictionary with 'subject', 'predicate', 'object' keys
+            triple: Triple record, or dictionary with 'subject', 'predicate',
+                'object' (and optionally 'chunk') keys
             
         Returns:
-            Normalized triple dictionary or None if invalid
+            Normalized Triple carrying its source chunk, or None if invalid
         """
-        subject_raw = triple.get('subject')
-        predicate_raw = triple.get('predicate')
-        object_raw = triple.get('object')
-        
-        # Check if all components are strings
-        if not all(isinstance(val, str) for val in [subject_raw, predicate_raw, object_raw]):
-            return None
+        if isinstance(triple, Triple):
+            # Produced by TripleValidator, so all components are strings
+            subject_raw, predicate_raw, object_raw, chunk_num = triple
+        else:
+            subject_raw = triple.get('subject')
+            predicate_raw = triple.get('predicate')
+            object_raw = triple.get('object')
+            chunk_num = triple.get('chunk', 'unknown')
+            
+            # Check if all components are strings
+            if not all(isinstance(val, str) for val in [subject_raw, predicate_raw, object_raw]):
+                return None
         
-        # Normalize: lowercase and trim whitespace
-        normalized_sub = subject_raw.strip().lower()
-        normalized_pred = re.sub(r'\s+', ' ', predicate_raw.strip().lower()).strip()
-        normalized_obj = object_raw.strip().lower()
+        # Normalize: lowercase and trim whitespace. split()/join() also
+        # collapses internal whitespace runs in the predicate to one space,
+        # in C and without a regex. Entities recur across many triples, so
+        # subjects and objects are interned: every occurrence shares one
+        # string, and set/dict lookups on them hit the identity fast path.
+        normalized_sub = sys.intern(subject_raw.strip().lower())
+        normalized_pred = ' '.join(predicate_raw.lower().split())
+        normalized_obj = sys.intern(object_raw.strip().lower())
         
         # Check for empty components
         if not all([normalized_sub, normalized_pred, normalized_obj]):
             return None
         
-        return {
-            'subject': normalized_sub,
-            'predicate': normalized_pred,
-            'object': normalized_obj,
-        }
+        return Triple(normalized_sub, normalized_pred, normalized_obj, chunk_num)
     
     def normalize_and_deduplicate(
         self,
-        triples: List[Dict[str, any]]
-    ) -> List[Dict[str, any]]:
+        triples: Iterable[Union[Triple, Dict[str, Any]]]
+    ) -> TripleStore:
         """
         Normalize and remove duplicate triples.
         
         Args:
-            triples: List of triple dictionaries
+            triples: Triple records or triple dictionaries
             
         Returns:
-            List of normalized, unique triples with source_chunk information
+            TripleStore of normalized, unique triples; each keeps the chunk
+            of the first occurrence as its source chunk
         """
-        normalized_triples = []
+        normalized_triples = TripleStore()
         self.seen_triples = set()
+        self._seen_hashes = set()
         self.empty_removed_count = 0
         self.duplicates_removed_count = 0
         
         for triple in triples:
-            # Preserve source chunk information
-            chunk_num = triple.get('chunk', 'unknown')
-            
-            # Normalize the triple
+            # Normalize the triple (preserves source chunk information)
             normalized = self.normalize_triple(triple)
             
             if normalized is None:
                 self.empty_removed_count += 1
                 continue
             
-            # Create identifier for deduplication
-            triple_identifier = (
-                normalized['subject'],
-                normalized['predicate'],
-                normalized['object']
-            )
+            # Create identifier for deduplication: the hash of the (subject,
+            # predicate, object) prefix of the record. Storing the int rather
+            # than the tuple keeps the seen set small on large streams; a
+            # 64-bit collision is negligible at any realistic triple count.
+            triple_identifier = normalized[:3]
+            triple_hash = hash(triple_identifier)
             
             # Check for duplicates
-            if triple_identifier in self.seen_triples:
+            if triple_hash in self._seen_hashes:
                 self.duplicates_removed_count += 1
                 continue
             
             # Add to results
-            normalized['source_chunk'] = chunk_num
             normalized_triples.append(normalized)
-            self.seen_triples.add(triple_identifier)
+            self._seen_hashes.add(triple_hash)
+            if self.keep_seen_triples:
+                self.seen_triples.add(triple_identifier)
         
         return normalized_triples
     
@@ -119,5 +138,6 @@ class TripleNormalizer:
     def reset(self):
         """Reset the normalizer state."""
         self.seen_triples.clear()
+        self._seen_hashes.clear()
         self.empty_removed_count = 0
         self.duplicates_removed_count = 0
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Shared fixtures for the test suite.
+Provides an LLMClient backed by a fake async OpenAI client.
+"""
+
+import asyncio
+import json
+import pytest
+from openai.types.chat import ChatCompletion
+from config.settings import settings
+import src.llm.client as client_module
+from src.llm.client import LLMClient
+
+
+def make_completion(content: str) -> ChatCompletion:
+    """Build a chat completion response with the given message content."""
+    return ChatCompletion.model_validate({
+        "id": "test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-model",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+    })
+
+
+class FakeAsyncCompletions:
+    """
+    Records requests and answers them with a reply function.
+    
+    The reply function gets the request parameters and returns the message
+    content, an exception to raise, or a coroutine producing either.
+    """
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+    
+    async def create(self, **params):
+        self.calls.append(params)
+        result = self.reply(params)
+        if asyncio.iscoroutine(result):
+            result = await result
+        if isinstance(result, BaseException):
+            raise result
+        return make_completion(result)
+
+
+class FakeAsyncOpenAI:
+    """Stand-in for openai.AsyncOpenAI; replies come from FakeOpenAI.reply."""
+    
+    def __init__(self, owner, **kwargs):
+        self.completions = FakeAsyncCompletions(lambda params: owner.reply(params))
+        self.chat = type("Chat", (), {"completions": self.completions})()
+        self.closed = False
+        owner.instances.append(self)
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeOpenAI:
+    """Factory replacing openai.AsyncOpenAI that tracks the clients it creates."""
+    
+    def __init__(self):
+        self.instances = []
+        self.reply = lambda params: json.dumps({"triples": []})
+    
+    def __call__(self, **kwargs):
+        return FakeAsyncOpenAI(self, **kwargs)
+    
+    @property
+    def calls(self):
+        return [call for instance in self.instances for call in instance.completions.calls]
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Route async API requests to a fake client."""
+    fake = FakeOpenAI()
+    monkeypatch.setattr(client_module.openai, "AsyncOpenAI", fake)
+    return fake
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    """Point the response caches at a temporary directory."""
+    monkeypatch.setattr(settings, "LLM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LLM_SEMANTIC_CACHE_ENABLED", False)
+    return tmp_path
+
+
+@pytest.fixture
+def llm_client(fake_openai, cache_dir):
+    """LLM client without response caching, talking to the fake API."""
+    return LLMClient(api_key="test-key", use_cache=False)
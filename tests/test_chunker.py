@@ -3,7 +3,7 @@ Unit tests for the TextChunker class.
 """
 
 import pytest
-from src.text_processing.chunker import TextChunker
+from src.text_processing.chunker import Chunk, TextChunker
 
 
 class TestTextChunker:
@@ -33,9 +33,8 @@ class TestTextChunker:
         chunks = chunker.chunk_text(text)
         
         assert len(chunks) > 1
-        assert all('text' in chunk for chunk in chunks)
-        assert all('chunk_number' in chunk for chunk in chunks)
-        assert chunks[0]['chunk_number'] == 1
+        assert all(isinstance(chunk, Chunk) for chunk in chunks)
+        assert chunks[0].chunk_number == 1
     
     def test_chunk_overlap(self):
         """Test that chunks have proper overlap."""
@@ -45,8 +44,8 @@ class TestTextChunker:
         
         if len(chunks) > 1:
             # Check that some words from end of first chunk appear in second
-            first_words = chunks[0]['text'].split()
-            second_words = chunks[1]['text'].split()
+            first_words = chunks[0].text.split()
+            second_words = chunks[1].text.split()
             # Last words of first chunk should be in second chunk
             assert any(word in second_words for word in first_words[-10:])
     
@@ -70,4 +69,21 @@ class TestTextChunker:
         chunks = chunker.chunk_text(text)
         
         assert len(chunks) == 1
-        assert chunks[0]['text'] == text
\ No newline at end of file
+        assert chunks[0].text == text
+    
+    def test_chunk_positions(self):
+        """Test that chunk records carry their (inclusive) word span and convert to dicts."""
+        text = " ".join([f"word{i}" for i in range(100)])
+        chunker = TextChunker(chunk_size=30, overlap=10)
+        chunks = chunker.chunk_text(text)
+        
+        assert [(chunk.start_word, chunk.end_word) for chunk in chunks[:2]] == [(0, 29), (20, 49)]
+        assert all(chunk.word_count == len(chunk.text.split()) for chunk in chunks)
+        assert chunks[-1].end_word == 99
+        assert chunks[0].asdict() == {
+            'text': " ".join([f"word{i}" for i in range(30)]),
+            'chunk_number': 1,
+            'start_word': 0,
+            'end_word': 29,
+            'word_count': 30,
+        }
@@ -0,0 +1,276 @@
+"""
+Unit tests for the TripleExtractor class.
+"""
+
+import asyncio
+import json
+import numpy as np
+import pytest
+import src.llm.cache as cache_module
+from config.settings import settings
+from src.extraction.extractor import TripleExtractor, is_extractable
+from src.llm.cache import SemanticCache
+from src.llm.client import LLMClient
+from src.llm.prompts import PromptTemplates
+from src.text_processing.chunker import Chunk
+
+PASSAGES = [
+    "Marie Curie was a physicist who discovered polonium and radium in Paris "
+    "together with her husband Pierre Curie and won two Nobel prizes.",
+    "Albert Einstein developed the theory of relativity while working at the "
+    "patent office in Bern and later moved to Princeton in the United States.",
+]
+
+CYRILLIC = (
+    "Мария Склодовская-Кюри была физиком и химиком польского происхождения, "
+    "которая открыла полоний и радий вместе со своим мужем Пьером Кюри в "
+    "Париже и дважды получила Нобелевскую премию за свои исследования."
+)
+
+
+def triple(subject, predicate, obj):
+    """Build a raw triple as the model returns it."""
+    return {"subject": subject, "predicate": predicate, "object": obj}
+
+
+def make_chunks(texts):
+    """Wrap texts in Chunk records numbered from 1."""
+    return [
+        Chunk(text, number, 0, len(text.split()), len(text.split()))
+        for number, text in enumerate(texts, 1)
+    ]
+
+
+@pytest.fixture
+def cached_client(fake_openai, cache_dir):
+    """LLM client with the memory and disk cache tiers enabled."""
+    return LLMClient(api_key="test-key", temperature=0.0, use_cache=True)
+
+
+@pytest.fixture
+def semantic_client(fake_openai, cache_dir, monkeypatch):
+    """Cached LLM client whose semantic cache treats every text as a near-duplicate."""
+    monkeypatch.setattr(settings, "LLM_SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(cache_module, "_STORES", {})
+    monkeypatch.setattr(SemanticCache, "_embed", lambda self, text: np.ones(8, dtype=np.float32) / np.sqrt(8))
+    return LLMClient(api_key="test-key", temperature=0.0, use_cache=True)
+
+
+class TestPackedExtraction:
+    """Test suite for packing several chunks into one request."""
+    
+    def test_packed_response_fans_out(self, cached_client, fake_openai):
+        """Test that each passage's triples go to its own chunk."""
+        fake_openai.reply = lambda params: json.dumps({
+            "1": [triple("marie curie", "discovered", "radium")],
+            "2": [triple("albert einstein", "developed", "theory of relativity")],
+        })
+        extractor = TripleExtractor(cached_client, prefilter=False, pack_tokens=1000)
+        
+        triples = extractor.extract_from_chunks(make_chunks(PASSAGES))
+        
+        assert len(fake_openai.calls) == 1
+        assert [(t.subject, t.chunk) for t in triples] == [
+            ("marie curie", 1), ("albert einstein", 2)
+        ]
+        assert extractor.get_failed_chunks() == []
+    
+    def test_single_chunk_shape_fails_pack(self, cached_client, fake_openai):
+        """Test that an answer without passage numbers fails every chunk and is not cached."""
+        fake_openai.reply = lambda params: json.dumps({
+            "triples": [triple("marie curie", "discovered", "radium")]
+        })
+        extractor = TripleExtractor(cached_client, prefilter=False, pack_tokens=1000)
+        
+        triples = extractor.extract_from_chunks(make_chunks(PASSAGES))
+        
+        assert triples == []
+        assert [chunk['chunk_number'] for chunk in extractor.get_failed_chunks()] == [1, 2]
+        assert len(cached_client.cache) == 0
+    
+    def test_missing_passage_fails(self, cached_client, fake_openai):
+        """Test that a passage left out of the answer counts as a failure."""
+        fake_openai.reply = lambda params: json.dumps({
+            "1": [triple("marie curie", "discovered", "radium")]
+        })
+        extractor = TripleExtractor(cached_client, prefilter=False, pack_tokens=1000)
+        
+        triples = extractor.extract_from_chunks(make_chunks(PASSAGES))
+        
+        assert [t.chunk for t in triples] == [1]
+        failed = extractor.get_failed_chunks()
+        assert [chunk['chunk_number'] for chunk in failed] == [2]
+        assert 'missing' in failed[0]['error']
+        assert len(cached_client.cache) == 0
+    
+    def test_packing_disabled(self, cached_client, fake_openai):
+        """Test that every chunk gets its own request without a token budget."""
+        extractor = TripleExtractor(cached_client, prefilter=False, pack_tokens=0)
+        
+        extractor.extract_from_chunks(make_chunks(PASSAGES))
+        
+        assert len(fake_openai.calls) == 2
+
+
+class TestPrefilter:
+    """Test suite for the chunk prefilter."""
+    
+    def test_accepts_prose(self):
+        """Test that ordinary prose passes the prefilter."""
+        assert is_extractable(PASSAGES[0])
+        assert is_extractable(CYRILLIC)
+    
+    def test_rejects_unlikely_chunks(self):
+        """Test that short, numeric and lowercased chunks are rejected."""
+        assert not is_extractable("Marie Curie won.")
+        assert not is_extractable(" ".join(str(i) for i in range(40)))
+        assert not is_extractable(PASSAGES[0].lower())
+        assert not is_extractable(CYRILLIC.lower())
+    
+    def test_disabled_by_default(self, llm_client, fake_openai):
+        """Test that lowercased chunks are extracted with default settings."""
+        extractor = TripleExtractor(llm_client)
+        
+        extractor.extract_from_chunks(make_chunks([p.lower() for p in PASSAGES]))
+        
+        assert len(fake_openai.calls) == 2
+        assert extractor.get_skipped_chunks() == []
+    
+    def test_skips_rejected_chunks(self, llm_client, fake_openai):
+        """Test that rejected chunks are never sent and are counted."""
+        extractor = TripleExtractor(llm_client, prefilter=True)
+        
+        extractor.extract_from_chunks(make_chunks([PASSAGES[0], "Marie Curie won."]))
+        
+        assert len(fake_openai.calls) == 1
+        assert extractor.get_skipped_chunks() == [2]
+        assert extractor.get_extraction_statistics(2, 0)['skipped_chunks'] == 1
+    
+    @pytest.mark.parametrize("text", ["Marie Curie won a Nobel Prize.", PASSAGES[0].lower()])
+    def test_only_chunk_is_extracted(self, llm_client, fake_openai, text):
+        """Test that a document's only chunk is never skipped."""
+        extractor = TripleExtractor(llm_client, prefilter=True)
+        
+        extractor.extract_from_chunks(make_chunks([text]))
+        list(extractor.iter_triples(iter(make_chunks([text]))))
+        
+        assert len(fake_openai.calls) == 2
+        assert extractor.get_skipped_chunks() == []
+    
+    def test_iter_triples_applies_prefilter(self, llm_client, fake_openai):
+        """Test that streamed multi-chunk documents are prefiltered."""
+        extractor = TripleExtractor(llm_client, max_concurrency=1, prefilter=True)
+        
+        list(extractor.iter_triples(iter(make_chunks(["Marie Curie won.", PASSAGES[0]]))))
+        
+        assert len(fake_openai.calls) == 1
+        assert extractor.get_skipped_chunks() == [1]
+
+
+class TestBatchExtraction:
+    """Test suite for concurrent extraction of many chunks."""
+    
+    def test_closes_http_clients(self, llm_client, fake_openai):
+        """Test that the async client of every batch's event loop is closed."""
+        extractor = TripleExtractor(llm_client, max_concurrency=1)
+        
+        extractor.extract_from_chunks(make_chunks(PASSAGES))
+        list(extractor.iter_triples(iter(make_chunks(PASSAGES))))
+        
+        # One client per event loop: one batch plus two single-chunk windows
+        assert len(fake_openai.instances) == 3
+        assert all(instance.closed for instance in fake_openai.instances)
+
+
+class TestResponseParsing:
+    """Test suite for parsing LLM output."""
+    
+    @pytest.fixture
+    def extractor(self, llm_client):
+        """Extractor whose parsers are tested directly."""
+        return TripleExtractor(llm_client)
+    
+    @pytest.mark.parametrize("raw_output", [
+        '[{"subject": "a", "predicate": "b", "object": "c"}]',
+        '  {"triples": [{"subject": "a", "predicate": "b", "object": "c"}]}',
+        '{"results": [{"subject": "a", "predicate": "b", "object": "c"}]}',
+        'Here is the JSON:\n```json\n[{"subject": "a", "predicate": "b", "object": "c"}]\n```',
+    ])
+    def test_parses_triple_lists(self, extractor, raw_output):
+        """Test that triples are found in every accepted output shape."""
+        assert extractor._parse_json_response(raw_output) == [triple("a", "b", "c")]
+    
+    @pytest.mark.parametrize("raw_output", [
+        'no json at all',
+        '{"first": [], "second": []}',
+        '"just a string"',
+        '[{"subject": "a"',
+    ])
+    def test_rejects_other_output(self, extractor, raw_output):
+        """Test that output without exactly one triple list is rejected."""
+        assert extractor._parse_json_response(raw_output) is None
+    
+    @pytest.mark.parametrize("raw_output", [
+        '{"1": [], "2": []}',
+        'Answer:\n```json\n{"1": [], "2": []}\n```',
+    ])
+    def test_parses_packed_objects(self, extractor, raw_output):
+        """Test that packed answers are found directly or inside text."""
+        assert extractor._parse_packed_response(raw_output) == {"1": [], "2": []}
+    
+    @pytest.mark.parametrize("raw_output", ['[[], []]', 'no json', '{"1": ['])
+    def test_rejects_other_packed_output(self, extractor, raw_output):
+        """Test that packed output that is not a JSON object is rejected."""
+        assert extractor._parse_packed_response(raw_output) is None
+
+
+class TestCachedExtraction:
+    """Test suite for the interaction of extraction and the response cache."""
+    
+    def test_unparseable_response_is_not_cached(self, cached_client, fake_openai):
+        """Test that a response that could not be parsed is requested again."""
+        replies = ["not json", json.dumps({"triples": [triple("marie curie", "won", "nobel prize")]})]
+        fake_openai.reply = lambda params: replies.pop(0)
+        chunks = make_chunks(PASSAGES[:1])
+        extractor = TripleExtractor(cached_client)
+        
+        assert extractor.extract_from_chunks(chunks) == []
+        assert len(extractor.get_failed_chunks()) == 1
+        assert len(cached_client.cache) == 0
+        
+        triples = extractor.extract_from_chunks(chunks)
+        assert [t.subject for t in triples] == ["marie curie"]
+        assert extractor.get_failed_chunks() == []
+        assert len(cached_client.cache) == 1
+    
+    def test_unchanged_chunks_are_served_from_cache(self, cached_client, fake_openai):
+        """Test that re-extracting a document does not call the API again."""
+        extractor = TripleExtractor(cached_client)
+        
+        extractor.extract_from_chunks(make_chunks(PASSAGES))
+        extractor.extract_from_chunks(make_chunks(PASSAGES))
+        
+        assert len(fake_openai.calls) == 2
+    
+    def test_unparseable_near_duplicate_is_not_reused(self, semantic_client, fake_openai):
+        """Test that a bad response served for a near-duplicate is dropped from the semantic cache."""
+        original = PASSAGES[0]
+        near_duplicate = original.replace("two Nobel prizes", "2 Nobel prizes")
+        
+        # An earlier run cached an unusable response for the original text
+        fake_openai.reply = lambda params: "not json"
+        asyncio.run(semantic_client.chat_completion_async(
+            *PromptTemplates.get_prompts_for_chunk(original), semantic_key=original
+        ))
+        
+        fake_openai.reply = lambda params: json.dumps({"triples": [triple("marie curie", "won", "nobel prize")]})
+        extractor = TripleExtractor(semantic_client)
+        
+        result = asyncio.run(extractor.extract_from_chunk_async(near_duplicate, 1))
+        assert result['error'] is not None
+        assert len(fake_openai.calls) == 1
+        assert len(semantic_client.semantic_cache) == 0
+        
+        result = asyncio.run(extractor.extract_from_chunk_async(near_duplicate, 1))
+        assert result['error'] is None
+        assert len(fake_openai.calls) == 2
@@ -0,0 +1,147 @@
+"""
+Unit tests for the GraphBuilder and CytoscapeConverter classes.
+"""
+
+import pytest
+from config.settings import settings
+from src.extraction.validator import Triple, TripleStore
+from src.graph.builder import GraphBuilder
+from src.graph.converter import CytoscapeConverter
+
+TRIPLES = [
+    Triple("marie curie", "discovered", "radium", 1),
+    Triple("marie curie", "won", "nobel prize", 1),
+    Triple("pierre curie", "married", "marie curie", 2),
+]
+
+
+@pytest.fixture
+def graph():
+    """Graph built from the sample triples."""
+    return GraphBuilder().build_graph(TRIPLES)
+
+
+class TestGraphBuilder:
+    """Test suite for GraphBuilder."""
+    
+    def test_build_from_records(self, graph):
+        """Test that triples become labeled directed edges."""
+        assert graph.number_of_nodes() == 4
+        assert graph.number_of_edges() == 3
+        assert graph.edges["marie curie", "radium"]["label"] == "discovered"
+    
+    def test_build_from_store(self, graph):
+        """Test that a TripleStore builds the same graph as Triple records."""
+        store = TripleStore()
+        for triple in TRIPLES:
+            store.append(triple)
+        
+        from_store = GraphBuilder().build_graph(store)
+        
+        assert sorted(from_store.edges(data='label')) == sorted(graph.edges(data='label'))
+    
+    def test_build_empty(self):
+        """Test that no triples give an empty graph."""
+        assert GraphBuilder().build_graph(TripleStore()).number_of_nodes() == 0
+    
+    def test_node_degrees_follow_graph_changes(self):
+        """Test that cached degrees are recomputed after the graph changes."""
+        builder = GraphBuilder()
+        graph = builder.build_graph(TRIPLES)
+        
+        assert builder.get_node_degrees()["marie curie"] == 3
+        graph.add_edge("marie curie", "paris", label="lived in")
+        assert builder.get_node_degrees()["marie curie"] == 4
+    
+    def test_node_degrees_follow_edge_swap(self):
+        """Test that replacing an edge recomputes degrees with unchanged counts."""
+        builder = GraphBuilder()
+        graph = builder.build_graph(TRIPLES)
+        
+        assert builder.get_node_degrees()["radium"] == 1
+        graph.remove_edge("marie curie", "radium")
+        graph.add_edge("pierre curie", "nobel prize", label="won")
+        
+        degrees = builder.get_node_degrees()
+        assert degrees["radium"] == 0
+        assert degrees["pierre curie"] == 2
+    
+    def test_top_nodes(self):
+        """Test that the most connected nodes come first."""
+        builder = GraphBuilder()
+        builder.build_graph(TRIPLES)
+        
+        assert builder.get_top_nodes(n=1) == [{'node': 'marie curie', 'degree': 3}]
+    
+    def test_node_info(self):
+        """Test incoming and outgoing edges of a node."""
+        builder = GraphBuilder()
+        builder.build_graph(TRIPLES)
+        
+        info = builder.get_node_info("marie curie")
+        
+        assert info['in_degree'] == 1 and info['out_degree'] == 2
+        assert info['incoming_edges'] == [{'from': 'pierre curie', 'relation': 'married'}]
+        assert builder.get_node_info("unknown") == {'error': 'Node not found'}
+    
+    def test_graph_statistics(self):
+        """Test the summary statistics of a connected graph."""
+        builder = GraphBuilder()
+        builder.build_graph(TRIPLES)
+        
+        stats = builder.get_graph_statistics()
+        
+        assert stats['num_nodes'] == 4 and stats['num_edges'] == 3
+        assert stats['is_weakly_connected']
+        assert stats['max_degree'] == 3 and stats['min_degree'] == 1
+
+
+class TestCytoscapeConverter:
+    """Test suite for CytoscapeConverter."""
+    
+    def test_convert_graph(self, graph):
+        """Test node and edge records in Cytoscape format."""
+        data = CytoscapeConverter().convert_graph(graph)
+        
+        nodes = {node['data']['id']: node['data'] for node in data['nodes']}
+        assert nodes['marie curie']['label'] == 'marie\ncurie'
+        assert nodes['marie curie']['degree'] == 3
+        assert nodes['marie curie']['tooltip_text'] == 'Entity: marie curie\nDegree: 3'
+        
+        edges = [edge['data'] for edge in data['edges']]
+        assert [edge['id'] for edge in edges] == ['edge_0', 'edge_1', 'edge_2']
+        assert {'source': 'pierre curie', 'target': 'marie curie', 'label': 'married'}.items() \
+            <= next(edge for edge in edges if edge['label'] == 'married').items()
+    
+    def test_node_sizes_scale_with_degree(self, graph):
+        """Test that node sizes grow linearly from the minimum to the maximum."""
+        data = CytoscapeConverter().convert_graph(graph)
+        
+        sizes = {node['data']['id']: node['data']['size'] for node in data['nodes']}
+        assert sizes['marie curie'] == settings.NODE_MIN_SIZE + settings.NODE_MAX_SIZE_FACTOR
+        assert sizes['radium'] == pytest.approx(
+            settings.NODE_MIN_SIZE + settings.NODE_MAX_SIZE_FACTOR / 3
+        )
+        assert all(type(size) is float for size in sizes.values())
+    
+    def test_uses_precomputed_degrees(self, graph):
+        """Test that precomputed degrees are used as given."""
+        degrees = {node: 1 for node in graph.nodes}
+        data = CytoscapeConverter().convert_graph(graph, degrees)
+        
+        assert {node['data']['degree'] for node in data['nodes']} == {1}
+    
+    def test_columnar_matches_records(self, graph):
+        """Test that the opt-in column arrays hold the same values as the records."""
+        converter = CytoscapeConverter()
+        columns = converter.convert_graph_columnar(graph)
+        data = converter.convert_graph(graph)
+        
+        assert columns['node_ids'].tolist() == [node['data']['id'] for node in data['nodes']]
+        assert columns['sizes'].tolist() == [node['data']['size'] for node in data['nodes']]
+        assert columns['edge_labels'].tolist() == [edge['data']['label'] for edge in data['edges']]
+    
+    def test_convert_empty_graph(self):
+        """Test that an empty graph converts to empty lists."""
+        data = CytoscapeConverter().convert_graph(GraphBuilder().build_graph([]))
+        assert data == {'nodes': [], 'edges': []}
@@ -0,0 +1,319 @@
+"""
+Unit tests for the LLMClient class.
+"""
+
+import asyncio
+import json
+import time
+import numpy as np
+import openai
+import pytest
+import src.llm.cache as cache_module
+import src.llm.client as client_module
+from src.llm.cache import ResponseCache, SemanticCache
+from src.llm.client import LLMClient
+from tests.conftest import make_completion
+
+
+def rate_limit_error():
+    """Build an openai.RateLimitError without an HTTP response."""
+    error = openai.RateLimitError.__new__(openai.RateLimitError)
+    Exception.__init__(error, "rate limited")
+    return error
+
+
+def user_text(params):
+    """Get the user message text of a request."""
+    return params["messages"][-1]["content"]
+
+
+def fake_embed(self, text):
+    """Deterministic unit embedding standing in for sentence-transformers."""
+    vector = np.zeros(8, dtype=np.float32)
+    vector[hash(text) % 8] = 1.0
+    return vector
+
+
+@pytest.fixture
+def semantic_cache_factory(monkeypatch, tmp_path):
+    """Create semantic caches in a temporary directory without a model."""
+    monkeypatch.setattr(SemanticCache, "_embed", fake_embed)
+    monkeypatch.setattr(cache_module, "_STORES", {})
+    return lambda: SemanticCache(cache_dir=str(tmp_path), threshold=0.99)
+
+
+@pytest.fixture
+def cached_client(fake_openai, cache_dir):
+    """LLM client with the memory and disk cache tiers enabled."""
+    return LLMClient(api_key="test-key", temperature=0.0, use_cache=True)
+
+
+class TestRequests:
+    """Test suite for building and sending requests."""
+    
+    def test_json_mode_by_default(self, llm_client, fake_openai):
+        """Test that requests ask for JSON output unless told otherwise."""
+        asyncio.run(llm_client.chat_completion_async("system", "user"))
+        asyncio.run(llm_client.chat_completion_async(
+            "system", "user", response_format={"type": "text"}
+        ))
+        
+        formats = [call["response_format"] for call in fake_openai.calls]
+        assert formats == [{"type": "json_object"}, {"type": "text"}]
+    
+    def test_retries_transient_errors(self, llm_client, fake_openai):
+        """Test that rate limit errors are retried until a request succeeds."""
+        errors = [rate_limit_error(), rate_limit_error()]
+        fake_openai.reply = lambda params: errors.pop() if errors else "done"
+        llm_client.retry_base_delay = 0
+        
+        response = asyncio.run(llm_client.chat_completion_async("system", "user"))
+        
+        assert llm_client.extract_content(response) == "done"
+        assert len(fake_openai.calls) == 3
+    
+    def test_gives_up_after_max_retries(self, llm_client, fake_openai):
+        """Test that a persistent rate limit error is raised after max_retries."""
+        fake_openai.reply = lambda params: rate_limit_error()
+        llm_client.retry_base_delay = 0
+        llm_client.max_retries = 2
+        
+        with pytest.raises(Exception, match="rate limited"):
+            asyncio.run(llm_client.chat_completion_async("system", "user"))
+        assert len(fake_openai.calls) == 3
+    
+    def test_does_not_retry_other_errors(self, llm_client, fake_openai):
+        """Test that non-transient errors fail on the first attempt."""
+        fake_openai.reply = lambda params: ValueError("bad request")
+        
+        with pytest.raises(Exception, match="bad request"):
+            asyncio.run(llm_client.chat_completion_async("system", "user"))
+        assert len(fake_openai.calls) == 1
+
+
+class TestBatchRequests:
+    """Test suite for concurrent requests."""
+    
+    def test_yields_in_completion_order(self, llm_client, fake_openai):
+        """Test that iter_chat_completions yields responses as they finish."""
+        async def reply(params):
+            index = int(user_text(params))
+            await asyncio.sleep(0.01 * (3 - index))
+            return str(index)
+        fake_openai.reply = reply
+        prompts = [("system", str(index)) for index in range(3)]
+        
+        async def collect():
+            return [index async for index, _ in llm_client.iter_chat_completions(prompts)]
+        
+        assert asyncio.run(collect()) == [2, 1, 0]
+    
+    def test_batch_keeps_input_order_and_exceptions(self, llm_client, fake_openai):
+        """Test that a failed request is returned in place without failing the batch."""
+        fake_openai.reply = lambda params: (
+            ValueError("boom") if user_text(params) == "1" else user_text(params)
+        )
+        prompts = [("system", str(index)) for index in range(3)]
+        
+        results = asyncio.run(llm_client.chat_completions_batch(prompts))
+        
+        assert llm_client.extract_content(results[0]) == "0"
+        assert isinstance(results[1], Exception) and "boom" in str(results[1])
+        assert llm_client.extract_content(results[2]) == "2"
+
+
+class TestResponseCache:
+    """Test suite for the memory and disk response cache tiers."""
+    
+    def test_repeated_request_hits_memory(self, cached_client, fake_openai):
+        """Test that an identical request is answered from memory."""
+        for _ in range(2):
+            asyncio.run(cached_client.chat_completion_async("system", "user"))
+        
+        assert len(fake_openai.calls) == 1
+        stats = cached_client.cache_stats()
+        assert stats["memory_hits"] == 1 and stats["misses"] == 1
+    
+    def test_new_client_hits_disk(self, cached_client, fake_openai):
+        """Test that responses persist across clients through the disk tier."""
+        asyncio.run(cached_client.chat_completion_async("system", "user"))
+        other = LLMClient(api_key="test-key", temperature=0.0, use_cache=True)
+        
+        response = asyncio.run(other.chat_completion_async("system", "user"))
+        
+        assert len(fake_openai.calls) == 1
+        assert other.cache_stats()["disk_hits"] == 1
+        assert other.extract_content(response) == json.dumps({"triples": []})
+    
+    def test_different_request_misses(self, cached_client, fake_openai):
+        """Test that requests differing in any parameter are cached apart."""
+        asyncio.run(cached_client.chat_completion_async("system", "user"))
+        asyncio.run(cached_client.chat_completion_async("system", "other user"))
+        asyncio.run(cached_client.chat_completion_async("system", "user", max_tokens=10))
+        
+        assert len(fake_openai.calls) == 3
+    
+    def test_sampled_requests_are_not_cached(self, fake_openai, cache_dir):
+        """Test that caching is off above the temperature guard."""
+        client = LLMClient(api_key="test-key", temperature=0.7, use_cache=True)
+        for _ in range(2):
+            asyncio.run(client.chat_completion_async("system", "user"))
+        
+        assert not client.cache_enabled
+        assert len(fake_openai.calls) == 2
+    
+    def test_discard_cached(self, cached_client, fake_openai):
+        """Test that a discarded response is fetched again from the API."""
+        asyncio.run(cached_client.chat_completion_async("system", "user"))
+        cached_client.discard_cached("system", "user")
+        asyncio.run(cached_client.chat_completion_async("system", "user"))
+        
+        assert len(fake_openai.calls) == 2
+        assert len(cached_client.cache) == 1
+    
+    def test_clear_cache(self, cached_client, fake_openai):
+        """Test that clearing the cache empties every tier."""
+        asyncio.run(cached_client.chat_completion_async("system", "user"))
+        cached_client.clear_cache()
+        
+        assert len(cached_client.cache) == 0
+        asyncio.run(cached_client.chat_completion_async("system", "user"))
+        assert len(fake_openai.calls) == 2
+    
+    def test_ttl_expiry(self, monkeypatch, tmp_path):
+        """Test that entries older than the TTL are dropped."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = ResponseCache(cache_dir=str(tmp_path), ttl=60)
+        cache.set("key", "value")
+        
+        now[0] += 30
+        assert cache.get("key") == "value"
+        now[0] += 60
+        assert cache.get("key") is None
+        assert len(cache) == 0
+    
+    def test_make_key_ignores_dict_order(self):
+        """Test that equal requests get equal keys regardless of key order."""
+        assert ResponseCache.make_key({"a": 1, "b": 2}) == ResponseCache.make_key({"b": 2, "a": 1})
+        assert ResponseCache.make_key({"a": 1}) != ResponseCache.make_key({"a": 2})
+
+
+class TestExtractJson:
+    """Test suite for extract_json."""
+    
+    def test_triples_wrapper(self, llm_client):
+        """Test that a JSON mode {"triples": [...]} answer is unwrapped."""
+        response = make_completion('{"triples": [{"subject": "a"}]}')
+        assert llm_client.extract_json(response) == [{"subject": "a"}]
+    
+    def test_bare_array(self, llm_client, monkeypatch):
+        """Test that a bare array is returned from the first parse."""
+        class CountingBackend:
+            calls = 0
+            
+            @staticmethod
+            def loads(text):
+                CountingBackend.calls += 1
+                return json.loads(text)
+        monkeypatch.setattr(client_module, "_json_backend", CountingBackend)
+        
+        assert llm_client.extract_json(make_completion('[{"subject": "a"}]')) == [{"subject": "a"}]
+        assert CountingBackend.calls == 1
+    
+    def test_array_in_text(self, llm_client):
+        """Test that a bare array surrounded by text is found."""
+        response = make_completion('Here it is: [{"subject": "a"}] done')
+        assert llm_client.extract_json(response) == [{"subject": "a"}]
+    
+    def test_no_array(self, llm_client):
+        """Test that content without an array raises ValueError."""
+        with pytest.raises(ValueError):
+            llm_client.extract_json(make_completion("no json here"))
+
+
+class TestRateLimiting:
+    """Test suite for client-side rate limiting."""
+    
+    def test_rpm_applies_across_calls(self, llm_client):
+        """Test that the requests-per-minute limit is shared by separate batches."""
+        rpm = 600
+        burst = [("system", f"burst {i}") for i in range(rpm)]
+        prompts = [("system", f"prompt {i}") for i in range(5)]
+        
+        start = time.monotonic()
+        asyncio.run(llm_client.chat_completions_batch(burst, rpm=rpm, tpm=0))
+        asyncio.run(llm_client.chat_completions_batch(prompts, rpm=rpm, tpm=0))
+        elapsed = time.monotonic() - start
+        
+        # The burst empties the bucket, which refills at rpm / 60 per second
+        assert elapsed >= 0.9 * len(prompts) * 60 / rpm
+    
+    def test_no_limit_by_default(self, llm_client, fake_openai):
+        """Test that requests are not held back without limits."""
+        prompts = [("system", f"prompt {i}") for i in range(20)]
+        
+        start = time.monotonic()
+        asyncio.run(llm_client.chat_completions_batch(prompts, rpm=0, tpm=0))
+        
+        assert time.monotonic() - start < 1.0
+        assert len(fake_openai.calls) == 20
+
+
+class TestAsyncClient:
+    """Test suite for the per-event-loop async client."""
+    
+    def test_aclose_releases_client(self, llm_client, fake_openai):
+        """Test that aclose() closes the client and the next loop gets a new one."""
+        async def request_and_close():
+            await llm_client.chat_completion_async("system", "user")
+            await llm_client.aclose()
+        
+        asyncio.run(request_and_close())
+        asyncio.run(request_and_close())
+        
+        assert len(fake_openai.instances) == 2
+        assert all(instance.closed for instance in fake_openai.instances)
+
+
+class TestSemanticCache:
+    """Test suite for the embedding-based cache."""
+    
+    def test_lookup_after_add(self, semantic_cache_factory):
+        """Test that an added response is found for the same text."""
+        cache = semantic_cache_factory()
+        embedding, value = cache.lookup("namespace", "text")
+        assert value is None
+        
+        cache.add("namespace", "text", embedding, "response")
+        
+        assert cache.lookup("namespace", "text")[1] == "response"
+        assert cache.lookup("other namespace", "text")[1] is None
+    
+    def test_delete_removes_matched_near_duplicate(self, semantic_cache_factory, monkeypatch):
+        """Test that deleting a text also drops the entry its lookup matched."""
+        monkeypatch.setattr(SemanticCache, "_embed", lambda self, text: np.ones(8, dtype=np.float32) / np.sqrt(8))
+        cache = semantic_cache_factory()
+        embedding, _ = cache.lookup("namespace", "Marie Curie won two Nobel prizes.")
+        cache.add("namespace", "Marie Curie won two Nobel prizes.", embedding, "response")
+        
+        cache.delete("namespace", "Marie Curie won 2 Nobel prizes.")
+        
+        assert len(cache) == 0
+    
+    def test_caches_in_one_directory_share_entries(self, semantic_cache_factory, monkeypatch):
+        """Test that saving one cache keeps the entries another cache added."""
+        first = semantic_cache_factory()
+        second = semantic_cache_factory()
+        
+        for cache, text in ((first, "first text"), (second, "second text")):
+            embedding, _ = cache.lookup("namespace", text)
+            cache.add("namespace", text, embedding, text.upper())
+        first.save()
+        second.save()
+        
+        # A new session loads both entries from disk
+        monkeypatch.setattr(cache_module, "_STORES", {})
+        reloaded = semantic_cache_factory()
+        assert len(reloaded) == 2
+        assert reloaded.lookup("namespace", "first text")[1] == "FIRST TEXT"
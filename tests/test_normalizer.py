@@ -0,0 +1,138 @@
+"""
+Unit tests for the TripleNormalizer class and TripleStore.
+"""
+
+import pytest
+from src.extraction.validator import Triple, TripleStore, TripleValidator
+from src.text_processing.normalizer import TripleNormalizer
+
+
+class TestTripleNormalizer:
+    """Test suite for TripleNormalizer."""
+    
+    def test_normalize_triple(self):
+        """Test lowercasing, trimming and predicate whitespace collapsing."""
+        normalizer = TripleNormalizer()
+        normalized = normalizer.normalize_triple(
+            Triple("  Marie Curie ", "Was   Born\tIN", "Warsaw ", 3)
+        )
+        assert normalized == Triple("marie curie", "was born in", "warsaw", 3)
+    
+    def test_normalize_dict(self):
+        """Test that triple dictionaries are accepted and invalid ones rejected."""
+        normalizer = TripleNormalizer()
+        assert normalizer.normalize_triple(
+            {'subject': 'A', 'predicate': 'B', 'object': 'C'}
+        ) == Triple('a', 'b', 'c', 'unknown')
+        assert normalizer.normalize_triple({'subject': 'A', 'predicate': 'B', 'object': 1}) is None
+        assert normalizer.normalize_triple({'subject': ' ', 'predicate': 'B', 'object': 'C'}) is None
+    
+    def test_entities_are_interned(self):
+        """Test that equal subjects and objects share one string object."""
+        normalizer = TripleNormalizer()
+        first = normalizer.normalize_triple(Triple("Marie Curie", "won", "Nobel Prize", 1))
+        second = normalizer.normalize_triple(Triple("MARIE CURIE", "discovered", "radium", 2))
+        assert first.subject is second.subject
+    
+    def test_deduplicate(self):
+        """Test that duplicates after normalization are removed, keeping the first chunk."""
+        normalizer = TripleNormalizer()
+        triples = [
+            Triple("Marie Curie", "won", "Nobel Prize", 1),
+            Triple("marie curie ", "WON", "nobel prize", 2),
+            Triple("Marie Curie", "discovered", "Radium", 2),
+            {'subject': '', 'predicate': 'won', 'object': 'x'},
+        ]
+        
+        store = normalizer.normalize_and_deduplicate(triples)
+        
+        assert isinstance(store, TripleStore)
+        assert list(store) == [
+            Triple("marie curie", "won", "nobel prize", 1),
+            Triple("marie curie", "discovered", "radium", 2),
+        ]
+        assert normalizer.get_statistics(len(triples)) == {
+            'original_count': 4,
+            'empty_removed': 1,
+            'duplicates_removed': 1,
+            'final_count': 2,
+        }
+    
+    def test_seen_triples_only_when_requested(self):
+        """Test that seen keys are only recorded with keep_seen_triples."""
+        triples = [Triple("a", "b", "c", 1)]
+        
+        normalizer = TripleNormalizer()
+        normalizer.normalize_and_deduplicate(triples)
+        assert normalizer.seen_triples == set()
+        
+        normalizer = TripleNormalizer(keep_seen_triples=True)
+        normalizer.normalize_and_deduplicate(triples)
+        assert normalizer.seen_triples == {("a", "b", "c")}
+    
+    def test_runs_are_independent(self):
+        """Test that each call deduplicates on its own input only."""
+        normalizer = TripleNormalizer()
+        triples = [Triple("a", "b", "c", 1)]
+        
+        normalizer.normalize_and_deduplicate(triples)
+        
+        assert len(normalizer.normalize_and_deduplicate(triples)) == 1
+
+
+class TestTripleStore:
+    """Test suite for the column-oriented TripleStore."""
+    
+    def test_columns_and_records(self):
+        """Test that appended triples are readable as columns and records."""
+        store = TripleStore()
+        store.append(Triple("a", "b", "c", 1))
+        store.append(Triple("d", "e", "f", 2))
+        
+        assert len(store) == 2
+        assert store.subjects == ["a", "d"]
+        assert store[1] == Triple("d", "e", "f", 2)
+        assert list(store) == [Triple("a", "b", "c", 1), Triple("d", "e", "f", 2)]
+        assert store.asdict() == {
+            'subject': ["a", "d"],
+            'predicate': ["b", "e"],
+            'object': ["c", "f"],
+            'chunk': [1, 2],
+        }
+    
+    def test_to_arrow(self):
+        """Test the Arrow export, including triples without a chunk number."""
+        pa = pytest.importorskip("pyarrow")
+        store = TripleStore()
+        store.append(Triple("a", "b", "c", 1))
+        store.append(Triple("a", "b", "d", "unknown"))
+        
+        table = store.to_arrow()
+        
+        assert pa.types.is_dictionary(table.schema.field('subject').type)
+        assert table.schema.field('chunk').type == pa.int64()
+        assert table.column('subject').to_pylist() == ["a", "a"]
+        assert table.column('object').to_pylist() == ["c", "d"]
+        assert table.column('chunk').to_pylist() == [1, None]
+    
+    def test_empty_store_is_falsy(self):
+        """Test that an empty store is falsy like an empty list."""
+        assert not TripleStore()
+
+
+class TestTripleValidator:
+    """Test suite for TripleValidator."""
+    
+    def test_validate_triples(self):
+        """Test that only complete string triples are kept, with their chunk."""
+        validator = TripleValidator()
+        raw = [
+            {'subject': 'a', 'predicate': 'b', 'object': 'c'},
+            {'subject': 'a', 'predicate': ' ', 'object': 'c'},
+            {'subject': 'a', 'predicate': 'b'},
+            {'subject': 'a', 'predicate': 'b', 'object': 1},
+            'not a dict',
+        ]
+        
+        assert validator.validate_triples(raw, 7) == [Triple('a', 'b', 'c', 7)]
+        assert validator.validate_triples("not a list") == []